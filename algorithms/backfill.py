@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from algorithms.base import ISchedulerAlgorithm
+from algorithms.best_fit import BestFitScheduler
+from core.availability import AvailabilityProfile
+from core.cluster import Cluster
+from core.node import Node
+from core.task import Task
+
+@dataclass
+class Reservation:
+    task: Task
+    node: Node
+    position: int
+    start_time: float
+
+class BackfillScheduler(BestFitScheduler):
+    """
+    EASY backfilling on top of best-fit placement.
+
+    The first task that does not fit while no reservation is held (the head of the
+    waiting queue) gets a reservation: the node and earliest time at which enough
+    of its running tasks will have ended, from their known end_times. Other tasks
+    may still start now, but on the reserved node only if they end before the
+    reservation or leave room for it, so the reserved task is never delayed.
+
+    Only a refusal that protects the reservation depends on more than the task's
+    shape; those are reported by refusal_blocks_shape() so the pending queue keeps
+    offering the task while it could still backfill, and blocks every other refusal.
+    """
+    select_nodes = ISchedulerAlgorithm.select_nodes  # every task must pass through select_node
+
+    def __init__(self, cluster: Cluster):
+        super().__init__(cluster)
+        self.reservation: Optional[Reservation] = None
+        # Built on demand and dropped when their node changes, so events stay O(1) here
+        self._profiles: Dict[str, AvailabilityProfile] = {}
+        for node in self.cluster.nodes:
+            node.watchers.append(self)
+
+    def node_changed(self, node: Node):
+        self._profiles.pop(node.id, None)
+
+    def _profile(self, node: Node) -> AvailabilityProfile:
+        profile = self._profiles.get(node.id)
+        if profile is None:
+            profile = self._profiles[node.id] = AvailabilityProfile(node)
+        return profile
+
+    def select_node(self, task: Task) -> str:
+        reservation = self.reservation
+        if reservation is not None and reservation.task.assigned_node is not None:
+            reservation = self.reservation = None  # placed by another path, e.g. preemption
+
+        if reservation is None or reservation.task is task:
+            node_id = self._best_fit(task)
+            if node_id is not None:
+                self.reservation = None
+            elif reservation is None or reservation.start_time <= self.now:
+                # New head of the queue, or its slot has passed without it fitting
+                self.reservation = self._reserve(task)
+            return node_id
+
+        node_id = self._best_fit(task)
+        if node_id is None or node_id != reservation.node.id or self._leaves_room(task, reservation):
+            return node_id
+        return self._best_fit(task, exclude=reservation.position)
+
+    def refusal_blocks_shape(self, task: Task) -> bool:
+        # A task that fits somewhere is only turned down when its sole fit is the reserved
+        # node; any other refusal (including the reserved task's own) means nothing fits it.
+        reservation = self.reservation
+        if reservation is None or reservation.task is task:
+            return True
+        node = reservation.node
+        return node.cpu_available < task.cpu or node.gpu_available < task.gpu
+
+    def _reserve(self, task: Task) -> Optional[Reservation]:
+        best = None
+        for position, node in enumerate(self.cluster.nodes):
+            if node.cpu_capacity < task.cpu or node.gpu_capacity < task.gpu:
+                continue
+            start_time = self._profile(node).earliest_fit(task.cpu, task.gpu, self.now)
+            if best is None or start_time < best.start_time:
+                best = Reservation(task, node, position, start_time)
+        if best is None or best.start_time == float('inf'):
+            return None
+        return best
+
+    def _leaves_room(self, task: Task, reservation: Reservation) -> bool:
+        """Whether starting the task on the reserved node now keeps the reservation intact."""
+        if self.now + task.work_left <= reservation.start_time:
+            return True
+        cpu_free, gpu_free = self._profile(reservation.node).free_at(reservation.start_time)
+        reserved = reservation.task
+        return cpu_free - task.cpu >= reserved.cpu and gpu_free - task.gpu >= reserved.gpu
@@ -1,12 +1,55 @@
 from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
 from core.task import Task
 from core.cluster import Cluster
 
 class ISchedulerAlgorithm(ABC):
+    now = 0.0  # current simulated time, set by the Scheduler before each placement
+
     def __init__(self, cluster: Cluster):
         self.cluster = cluster
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("select_node", None)  # instrumentation wrappers, re-applied after a resume
+        state.pop("select_nodes", None)
+        return state
+
     @abstractmethod
     def select_node(self, task: Task) -> str:
         """Return the ID of a node that can host the task, or None if no fit found."""
-        pass
\ No newline at end of file
+        pass
+
+    def refusal_blocks_shape(self, task: Task) -> bool:
+        """
+        Whether select_node() just turning the task down means no node can currently
+        fit its shape, so the pending queue need not offer that shape, or larger ones,
+        until capacity is freed. Strategies that may refuse a task for more than its
+        shape (e.g. its duration) return False for those refusals.
+        """
+        return True
+
+    def select_nodes(self, tasks: List[Task], place: Callable[[Task, str], None]) -> List[Optional[str]]:
+        """
+        Choose nodes for a batch of tasks, in order. place(task, node_id) is called for
+        each chosen node before the next task is considered, so later choices see the
+        capacity taken by earlier ones. Returns the node ID per task, None where it did not fit.
+
+        The default adapter calls select_node() per task. Capacity only shrinks within a
+        batch, so once a shape fails, tasks asking for at least as much are not retried
+        (unless the strategy says the refusal was not about the shape).
+        """
+        node_ids = []
+        failed = []
+        for task in tasks:
+            if any(task.cpu >= cpu and task.gpu >= gpu for cpu, gpu in failed):
+                node_ids.append(None)
+                continue
+            node_id = self.select_node(task)
+            if node_id is None:
+                if self.refusal_blocks_shape(task):
+                    failed.append((task.cpu, task.gpu))
+            else:
+                place(task, node_id)
+            node_ids.append(node_id)
+        return node_ids
@@ -1,25 +1,59 @@
+from typing import Callable, List, Optional
 from algorithms.base import ISchedulerAlgorithm
 from core.task import Task
+from core.cluster import Cluster
+from core.node_index import NodeIndex
 
 class BestFitScheduler(ISchedulerAlgorithm):
+    def __init__(self, cluster: Cluster):
+        super().__init__(cluster)
+        if not self.cluster.vectorized:
+            self.index = NodeIndex(self.cluster.get_all_nodes())
+
     def select_node(self, task: Task) -> str:
         """
         Selects the node where the remaining CPU+GPU after assignment is minimized,
         while still fitting the task.
         """
+        return self._best_fit(task)
+
+    def _best_fit(self, task: Task, exclude: Optional[int]=None) -> str:
+        """Best-fit choice, passing over the node at position `exclude` if given."""
+        if self.cluster.vectorized:
+            return self._select_node_vectorized(task, exclude)
+
         best_node_id = None
-        best_score = float('inf')
+        best_key = None
 
-        for node in self.cluster.get_all_nodes():
-            if not node.can_fit(task):
-                continue
+        # Only the tightest fitting node of each index bucket can win
+        for node in self.index.candidates(task, exclude):
             # Calculate how "tight" the fit is
             cpu_remain = node.cpu_available - task.cpu
             gpu_remain = node.gpu_available - task.gpu
             score = cpu_remain + gpu_remain  # Lower is better
+            key = (score, self.index.position(node))  # Earlier nodes win ties
 
-            if score < best_score:
-                best_score = score
+            if best_key is None or key < best_key:
+                best_key = key
                 best_node_id = node.id
-                
-        return best_node_id
\ No newline at end of file
+
+        return best_node_id
+
+    def _select_node_vectorized(self, task: Task, exclude: Optional[int]=None) -> str:
+        cluster = self.cluster
+        mask = cluster.fit_mask(task)
+        if exclude is not None:
+            mask[exclude] = False
+        fits = mask.nonzero()[0]
+        if len(fits) == 0:
+            return None
+        score = (cluster.cpu_available[fits] - task.cpu) + (cluster.gpu_available[fits] - task.gpu)
+        return cluster.nodes[fits[score.argmin()]].id  # argmin keeps the earliest node on ties
+
+    def select_nodes(self, tasks: List[Task], place: Callable[[Task, str], None]) -> List[Optional[str]]:
+        if not self.cluster.vectorized:
+            return super().select_nodes(tasks, place)
+        cluster = self.cluster
+        def score(at, cpu, gpu):
+            return (cluster.cpu_available[at] - cpu) + (cluster.gpu_available[at] - gpu)
+        return cluster.select_nodes_by_score(tasks, place, score)
@@ -1,18 +1,49 @@
+from typing import Callable, List, Optional
 from algorithms.base import ISchedulerAlgorithm
 from core.task import Task
+from core.cluster import Cluster
+from core.node_index import NodeIndex
 
 class BinPackingScheduler(ISchedulerAlgorithm):
+    def __init__(self, cluster: Cluster):
+        super().__init__(cluster)
+        if not self.cluster.vectorized:
+            self.index = NodeIndex(self.cluster.nodes)
+
     def select_node(self, task: Task) -> str:
-        # Sort nodes by how full they are (descending) to pack tightly
-        sorted_nodes = sorted(
-            self.cluster.nodes,
-            key=lambda node: (node.cpu_capacity - node.cpu_available) + 
-                             (node.gpu_capacity - node.gpu_available),
-            reverse=True
-        )
-
-        for node in sorted_nodes:
-            if node.can_fit(task):
-                return node.id
-
-        return None
\ No newline at end of file
+        if self.cluster.vectorized:
+            return self._select_node_vectorized(task)
+
+        # Pick the fullest node that fits to pack tightly; within an index bucket
+        # the fullest fitting node is the one with the least CPU left
+        best_node_id = None
+        best_key = None
+
+        for node in self.index.candidates(task):
+            used = (node.cpu_capacity - node.cpu_available) + \
+                   (node.gpu_capacity - node.gpu_available)
+            key = (-used, self.index.position(node))  # Earlier nodes win ties
+
+            if best_key is None or key < best_key:
+                best_key = key
+                best_node_id = node.id
+
+        return best_node_id
+
+    def _select_node_vectorized(self, task: Task) -> str:
+        cluster = self.cluster
+        fits = cluster.fit_mask(task).nonzero()[0]
+        if len(fits) == 0:
+            return None
+        used = (cluster.cpu_capacity[fits] - cluster.cpu_available[fits]) + \
+               (cluster.gpu_capacity[fits] - cluster.gpu_available[fits])
+        return cluster.nodes[fits[used.argmax()]].id  # argmax keeps the earliest node on ties
+
+    def select_nodes(self, tasks: List[Task], place: Callable[[Task, str], None]) -> List[Optional[str]]:
+        if not self.cluster.vectorized:
+            return super().select_nodes(tasks, place)
+        cluster = self.cluster
+        def score(at, cpu, gpu):  # fullest node first
+            return -((cluster.cpu_capacity[at] - cluster.cpu_available[at]) +
+                     (cluster.gpu_capacity[at] - cluster.gpu_available[at]))
+        return cluster.select_nodes_by_score(tasks, place, score)
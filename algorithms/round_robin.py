@@ -1,8 +1,7 @@
 from algorithms.base import ISchedulerAlgorithm
 from core.task import Task
 from core.cluster import Cluster
-from core.node import Node
-from typing import List, Optional
+from typing import Optional
 
 class RoundRobinScheduler(ISchedulerAlgorithm):
     def __init__(self, cluster: Cluster):
@@ -11,15 +10,31 @@ class RoundRobinScheduler(ISchedulerAlgorithm):
         self.current_index = 0  # Keeps track of where to start next
 
     def select_node(self, task: Task) -> Optional[str]:
+        if self.cluster.vectorized:
+            return self._select_node_vectorized(task)
+
         num_nodes = len(self.nodes)
-        attempts = 0
+        start = self.current_index
+
+        # One lap from current_index, probing only pools whose nodes could ever fit the task
+        ranges = self.cluster.fitting_ranges(task)
+        laps = [(max(lo, start), hi) for lo, hi in ranges if hi > start] + \
+               [(lo, min(hi, start)) for lo, hi in ranges if lo < start]
+        for lo, hi in laps:
+            for position in range(lo, hi):
+                if self.nodes[position].can_fit(task):
+                    self.current_index = (position + 1) % num_nodes
+                    return self.nodes[position].id
 
-        while attempts < num_nodes:
-            node = self.nodes[self.current_index]
-            self.current_index = (self.current_index + 1) % num_nodes
-            attempts += 1
+        return None
 
-            if node.can_fit(task):
-                return node.id
+    def _select_node_vectorized(self, task: Task) -> Optional[str]:
+        fits = self.cluster.fit_mask(task).nonzero()[0]
+        if len(fits) == 0:
+            return None  # A full unsuccessful lap leaves current_index unchanged
 
-        return None
\ No newline at end of file
+        # First fitting node at or after current_index, wrapping around
+        k = fits.searchsorted(self.current_index)
+        position = fits[k] if k < len(fits) else fits[0]
+        self.current_index = (int(position) + 1) % len(self.nodes)
+        return self.nodes[position].id
@@ -0,0 +1,3 @@
+"""
+Benchmark harness for simulator and scheduling-algorithm throughput.
+"""
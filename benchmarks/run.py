@@ -0,0 +1,139 @@
+"""
+Runs every algorithm headless on reproducible synthetic traces and stores
+throughput, peak RSS and per-phase timings as JSON, one file per commit.
+
+    python -m benchmarks.run --sizes 10k 100k --algorithms best_fit bin_packing
+    python -m benchmarks.run --compare benchmarks/results/<old-commit>.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Dict, List
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from trace.synthetic import generate_trace
+from main import get_algorithm, get_cluster
+
+SIZES = {
+    "10k": {"num_tasks": 10_000, "num_nodes": 100},
+    "100k": {"num_tasks": 100_000, "num_nodes": 1_000},
+    "1m": {"num_tasks": 1_000_000, "num_nodes": 10_000},
+    "10m": {"num_tasks": 10_000_000, "num_nodes": 100_000},
+}
+ALGORITHMS = ["best_fit", "round_robin", "bin_packing", "backfill"]
+NODE_CPU = 192
+NODE_GPU = 2
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+def run_case(case: Dict) -> Dict:
+    """Run one benchmark case; executed in a fresh process so peak RSS is per case."""
+    cluster_config = {"num_nodes": case["num_nodes"], "node_cpu": NODE_CPU, "node_gpu": NODE_GPU,
+                      "backend": case["backend"]}
+    cluster = get_cluster(cluster_config)
+    scheduler = Scheduler(strategy=get_algorithm(case["algorithm"], cluster))
+    tasks = generate_trace(case["num_tasks"], total_cpu=case["num_nodes"] * NODE_CPU, seed=case["seed"],
+                           max_cpu=NODE_CPU, max_gpu=NODE_GPU)
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as logs_dir:
+        config = {"algorithm": case["algorithm"], "verbose": False, "logs_dir": logs_dir,
+                  "streaming_metrics": True, "instrumentation": {"enabled": True}}
+        sim = Simulator(cluster, scheduler, tasks, config)
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            sim.run()
+        wall_time = time.perf_counter() - start
+
+    placements = sim.metrics.tasks_completed
+    events = sim.task_index + placements  # every placed task also completes once
+    instrumentation = sim.instrumentation.summary()
+    result = dict(case)
+    result.update({
+        "wall_time_s": wall_time,
+        "events": events,
+        "events_per_s": events / wall_time,
+        "ticks": instrumentation["phase_calls"]["release"],
+        "placements": placements,
+        "placements_per_s": placements / wall_time,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "phase_time_s": instrumentation["phase_time_s"],
+        "select_node_time_s": instrumentation["select_node_time_s"],
+        "placement_attempts": instrumentation["placement_attempts"],
+    })
+    return result
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def case_key(result: Dict) -> tuple:
+    return (result["size"], result["algorithm"], result["backend"], result["seed"])
+
+def compare(results: List[Dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = {case_key(r): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path} (events/s, >1 is faster):")
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old is None:
+            continue
+        ratio = result["events_per_s"] / old["events_per_s"]
+        print(f"  {result['size']:>5} {result['algorithm']:<12} {result['backend']:<7} {ratio:6.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"], choices=list(SIZES))
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--backend", default="python", choices=["python", "numpy"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare events/s against")
+    args = parser.parse_args()
+
+    cases = [
+        {"size": size, "algorithm": algorithm, "backend": args.backend, "seed": args.seed, **SIZES[size]}
+        for size in args.sizes for algorithm in args.algorithms
+    ]
+    # One fresh process per case keeps peak RSS and warm caches from leaking between cases
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+        for result in pool.map(run_case, cases):
+            print(f"{result['size']:>5} {result['algorithm']:<12} {result['wall_time_s']:8.2f}s "
+                  f"{result['events_per_s']:10.0f} events/s {result['placements_per_s']:10.0f} placements/s "
+                  f"{result['peak_rss_bytes'] / 2**20:8.1f} MiB")
+            results.append(result)
+
+    commit = git_commit()
+    output = args.output or os.path.join("benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measures the accuracy-vs-speed tradeoff of sharded simulation: runs the
+single-process Simulator once, then ShardedSimulator for every shard count and
+dispatch policy, and reports the speedup and each summary metric's relative
+error against the single-process result.
+
+    python -m benchmarks.sharding --size 1m --shards 2 4 8 --policies least_loaded hash
+    python -m benchmarks.sharding --trace alibaba_trace.csv --num-nodes 100 --shards 2 4
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict, Iterable
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from core.sharding import DISPATCH_POLICIES, ShardedSimulator
+from core.task import Task
+from trace.parser import load_trace
+from trace.synthetic import generate_trace
+from benchmarks.run import ALGORITHMS, NODE_CPU, NODE_GPU, SIZES, git_commit
+from main import get_algorithm, get_cluster
+
+def make_tasks(args) -> Iterable[Task]:
+    if args.trace:
+        return load_trace(args.trace)
+    return generate_trace(SIZES[args.size]["num_tasks"], total_cpu=args.num_nodes * NODE_CPU, seed=args.seed,
+                          max_cpu=NODE_CPU, max_gpu=NODE_GPU)
+
+def run_single(args, cluster_config: Dict, logs_dir: str) -> Dict:
+    cluster = get_cluster(cluster_config)
+    scheduler = Scheduler(strategy=get_algorithm(args.algorithm, cluster))
+    config = {"algorithm": args.algorithm, "verbose": False, "streaming_metrics": True, "logs_dir": logs_dir}
+    sim = Simulator(cluster, scheduler, make_tasks(args), config)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        sim.run()
+    return {"shards": 1, "policy": None, "wall_time_s": time.perf_counter() - start, "summary": sim.metrics.summary()}
+
+def run_sharded(args, cluster_config: Dict, shards: int, policy: str, logs_dir: str) -> Dict:
+    config = {"algorithm": args.algorithm, "logs_dir": logs_dir,
+              "sharding": {"shards": shards, "policy": policy, "barrier_ms": args.barrier_ms}}
+    sim = ShardedSimulator(cluster_config, make_tasks(args), config)
+    with redirect_stdout(io.StringIO()):
+        sim.run()
+    return {"shards": shards, "policy": policy, "wall_time_s": sim.wall_time_s, "summary": sim.metrics.summary()}
+
+def relative_errors(summary: Dict[str, float], reference: Dict[str, float]) -> Dict[str, float]:
+    return {
+        key: abs(summary[key] - ref) / abs(ref) if ref else abs(summary[key])
+        for key, ref in reference.items() if key in summary
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="100k", choices=list(SIZES), help="synthetic trace size")
+    parser.add_argument("--trace", help="replay this trace file instead of a synthetic one")
+    parser.add_argument("--num-nodes", type=int, help="cluster size (default: the size's node count)")
+    parser.add_argument("--algorithm", default="best_fit", choices=ALGORITHMS)
+    parser.add_argument("--backend", default="python", choices=["python", "numpy"])
+    parser.add_argument("--shards", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--policies", nargs="+", default=list(DISPATCH_POLICIES), choices=list(DISPATCH_POLICIES))
+    parser.add_argument("--barrier-ms", type=float, default=60000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/sharding-<commit>.json)")
+    args = parser.parse_args()
+    args.num_nodes = args.num_nodes or SIZES[args.size]["num_nodes"]
+
+    cluster_config = {"num_nodes": args.num_nodes, "node_cpu": NODE_CPU, "node_gpu": NODE_GPU, "backend": args.backend}
+    with tempfile.TemporaryDirectory(prefix="bench-sharding-") as logs_dir:
+        single = run_single(args, cluster_config, os.path.join(logs_dir, "single"))
+        print(f"single process {single['wall_time_s']:8.2f}s")
+        results = [single]
+        for shards in args.shards:
+            for policy in args.policies:
+                result = run_sharded(args, cluster_config, shards, policy, os.path.join(logs_dir, f"{shards}-{policy}"))
+                result["speedup"] = single["wall_time_s"] / result["wall_time_s"]
+                result["relative_error"] = relative_errors(result["summary"], single["summary"])
+                worst = max(result["relative_error"].items(), key=lambda item: item[1], default=("-", 0.0))
+                print(f"{shards:>3} shards {policy:<13} {result['wall_time_s']:8.2f}s {result['speedup']:6.2f}x  "
+                      f"avg wait err {result['relative_error'].get('avg_wait_time_ms', 0.0):7.2%}  "
+                      f"cpu util err {result['relative_error'].get('avg_cpu_utilization', 0.0):7.2%}  "
+                      f"worst: {worst[0]} {worst[1]:.2%}")
+                results.append(result)
+
+    commit = git_commit()
+    output = args.output or os.path.join("benchmarks", "results", f"sharding-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "trace": args.trace or f"synthetic-{args.size}",
+            "num_nodes": args.num_nodes,
+            "algorithm": args.algorithm,
+            "backend": args.backend,
+            "barrier_ms": args.barrier_ms,
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,212 @@
+"""
+Convert a raw Alibaba instance table into a simulator trace, sorted by submit_time.
+
+The raw file is cut into byte ranges at record boundaries and the ranges are parsed,
+filtered and sorted by a pool of worker processes; their outputs are merged back
+in order. Rows that are dropped are counted per reason.
+
+    python convert_trace.py [raw/raw_trace_alibaba.csv] [alibaba_trace.csv]
+        [--min-duration MS] [--max-duration MS] [--gpu-only]
+        [--start MS] [--end MS] [--sample RATE] [--seed N] [--workers N]
+
+Output paths ending in .npy are written as binary traces (see trace.binary).
+"""
+import argparse
 import csv
+import heapq
+import io
+import multiprocessing
+import os
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_RAW_PATH = "raw/raw_trace_alibaba.csv"
+DEFAULT_MAX_DURATION = 300_000.0
+RAW_COLUMNS = ["instance_sn", "scheduled_time", "deletion_time", "cpu_request", "gpu_request"]
+
+Row = Tuple[str, float, float, int, float]  # (id, submit_time, cpu, gpu, duration)
+
+@dataclass
+class TraceFilter:
+    """Which raw rows to keep. Durations and times are in ms; bounds are inclusive except `end`."""
+    min_duration: Optional[float] = None
+    max_duration: Optional[float] = DEFAULT_MAX_DURATION
+    gpu_only: bool = False
+    start: Optional[float] = None  # keep tasks submitted at or after this time
+    end: Optional[float] = None    # and before this time
+    sample: float = 1.0            # fraction of the remaining tasks to keep
+    seed: int = 0
 
-with open("raw/raw_trace_alibaba.csv", newline='') as infile, \
-     open("alibaba_trace.csv", "w", newline='') as outfile:
+    def sampled(self, task_id: str) -> bool:
+        # Hashing the id keeps the sample independent of chunking and worker count
+        return zlib.crc32(task_id.encode(), self.seed) < self.sample * 2**32
 
-    reader = csv.DictReader(infile)
-    writer = csv.writer(outfile)
-    writer.writerow(["id", "submit_time", "cpu", "gpu", "duration"])
+@dataclass
+class ConversionReport:
+    rows: int
+    kept: int
+    dropped: Dict[str, int]  # reason -> number of rows
 
-    for row in reader:
+def _parse_rows(records: Iterator[List[str]], columns: List[int], filters: TraceFilter,
+                dropped: Counter) -> Iterator[Row]:
+    id_col, scheduled_col, deletion_col, cpu_col, gpu_col = columns
+    for row in records:
         try:
-            task_id = row["instance_sn"]
-            submit_time = float(row["creation_time"])
-            scheduled_time = float(row["scheduled_time"])
-            deletion_time = float(row["deletion_time"])
-            cpu = float(row["cpu_request"])
-            gpu = int(row["gpu_request"])
-            duration = deletion_time - scheduled_time
-
-            if duration > 300_000:
+            task_id = row[id_col]
+            scheduled = row[scheduled_col]
+            deletion = row[deletion_col]
+            if not scheduled or not deletion:
+                dropped["incomplete"] += 1  # never scheduled, or still running at trace end
                 continue
-            writer.writerow([task_id, scheduled_time, cpu, gpu, duration])
-        except Exception:
-            continue  
\ No newline at end of file
+            submit_time = float(scheduled)
+            duration = float(deletion) - submit_time
+            cpu = float(row[cpu_col])
+            gpu = int(row[gpu_col])
+        except (IndexError, ValueError):
+            dropped["malformed"] += 1
+            continue
+
+        if ((filters.max_duration is not None and duration > filters.max_duration)
+                or (filters.min_duration is not None and duration < filters.min_duration)):
+            dropped["duration"] += 1
+        elif filters.gpu_only and gpu == 0:
+            dropped["no_gpu"] += 1
+        elif ((filters.start is not None and submit_time < filters.start)
+                or (filters.end is not None and submit_time >= filters.end)):
+            dropped["time_window"] += 1
+        elif filters.sample < 1.0 and not filters.sampled(task_id):
+            dropped["sampled_out"] += 1
+        else:
+            yield task_id, submit_time, cpu, gpu, duration
+
+def _convert_chunk(args) -> Tuple[List[Row], int, Counter]:
+    """Parse one byte range of the raw file; returns its kept rows sorted by submit_time."""
+    path, start, end, columns, filters = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode()
+    dropped = Counter()
+    records = 0
+
+    def counted(reader):
+        nonlocal records
+        for record in reader:
+            records += 1
+            yield record
+
+    reader = csv.reader(io.StringIO(text, newline=""))
+    rows = sorted(_parse_rows(counted(reader), columns, filters, dropped), key=lambda row: row[1])
+    return rows, records, dropped
+
+def _chunk_ranges(path: str, chunk_bytes: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Read the header and cut the rest of the file into ranges of about chunk_bytes
+    that end at record boundaries. Quotes are counted along the way, so a newline
+    inside a quoted field never ends a range.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode()]))
+        size = os.fstat(f.fileno()).st_size
+        ranges = []
+        start = end = f.tell()
+        quoted = False  # whether `end` falls inside a quoted field; "" escapes count twice
+        while end < size:
+            block = f.read(chunk_bytes)
+            end += len(block)
+            quoted ^= block.count(b'"') % 2 == 1
+            while end < size:  # run on to the first newline outside quotes
+                line = f.readline()
+                end += len(line)
+                quoted ^= line.count(b'"') % 2 == 1
+                if not quoted:
+                    break
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+def read_raw_trace(path: str, filters: Optional[TraceFilter]=None, workers: Optional[int]=None,
+                   chunk_bytes: int=16 << 20, report: Optional[ConversionReport]=None) -> Iterator[Row]:
+    """
+    Yield (id, submit_time, cpu, gpu, duration) rows from a raw Alibaba instance
+    table in submit_time order, ties in file order. `report`, if given, is filled
+    in with row counts once the rows have been parsed.
+    """
+    filters = filters or TraceFilter()
+    header, ranges = _chunk_ranges(path, chunk_bytes)
+    missing = [c for c in RAW_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"'{path}' is not a raw instance table, missing columns: {', '.join(missing)}")
+    columns = [header.index(c) for c in RAW_COLUMNS]
+    jobs = [(path, start, end, columns, filters) for start, end in ranges]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            chunks = pool.map(_convert_chunk, jobs)
+    else:
+        chunks = [_convert_chunk(job) for job in jobs]
+
+    if report is not None:
+        dropped = sum((chunk[2] for chunk in chunks), Counter())
+        report.rows = sum(chunk[1] for chunk in chunks)
+        report.kept = sum(len(chunk[0]) for chunk in chunks)
+        report.dropped = dict(dropped.most_common())
+    # merge() is stable across its inputs, so ties keep file order like a global sort
+    return heapq.merge(*(chunk[0] for chunk in chunks), key=lambda row: row[1])
+
+def convert(raw_path: str, out_path: str, filters: Optional[TraceFilter]=None,
+            workers: Optional[int]=None) -> ConversionReport:
+    """Convert a raw trace to a CSV trace, or to a binary trace if out_path ends with .npy."""
+    report = ConversionReport(rows=0, kept=0, dropped={})
+    rows = read_raw_trace(raw_path, filters, workers, report=report)
+
+    if out_path.endswith(".npy"):
+        from trace.binary import write_binary_trace  # NumPy is only needed for binary traces
+        columns = list(zip(*rows)) or [[]] * 5
+        write_binary_trace(out_path, *columns)
+        return report
+
+    with open(out_path, "w", newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(["id", "submit_time", "cpu", "gpu", "duration"])
+        writer.writerows(rows)
+    return report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", nargs="?", default=DEFAULT_RAW_PATH, help="raw instance table (CSV)")
+    parser.add_argument("output", nargs="?", default="alibaba_trace.csv", help="trace to write (.csv or .npy)")
+    parser.add_argument("--min-duration", type=float, help="drop tasks shorter than this (ms)")
+    parser.add_argument("--max-duration", type=float, default=DEFAULT_MAX_DURATION,
+                        help="drop tasks longer than this (ms); <= 0 keeps all")
+    parser.add_argument("--gpu-only", action="store_true", help="keep only tasks requesting GPUs")
+    parser.add_argument("--start", type=float, help="keep tasks submitted at or after this time (ms)")
+    parser.add_argument("--end", type=float, help="keep tasks submitted before this time (ms)")
+    parser.add_argument("--sample", type=float, default=1.0, help="fraction of tasks to keep, by task id hash")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --sample")
+    parser.add_argument("--workers", type=int, help="parser processes (default: one per core)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if not 0.0 < args.sample <= 1.0:
+        raise SystemExit("--sample must be in (0, 1]")
+    filters = TraceFilter(
+        min_duration=args.min_duration,
+        max_duration=args.max_duration if args.max_duration > 0 else None,
+        gpu_only=args.gpu_only,
+        start=args.start,
+        end=args.end,
+        sample=args.sample,
+        seed=args.seed
+    )
+    report = convert(args.raw, args.output, filters, args.workers)
+
+    print(f"Wrote {args.output}: kept {report.kept} of {report.rows} rows")
+    for reason, count in report.dropped.items():
+        print(f"  - dropped {count} ({reason})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from core.cluster import Cluster, cluster_size
+from core.node import Node
+from core.task import Task
+
+class ArrayNode(Node):
+    """Thin Node view whose capacity and availability live in the cluster's arrays."""
+    def __init__(self, cluster: "ArrayCluster", position: int, id: str, cpu_capacity: float, gpu_capacity: int):
+        self._cluster = cluster
+        self.position = position
+        super().__init__(id=id, cpu_capacity=cpu_capacity, gpu_capacity=gpu_capacity)
+
+    @property
+    def cpu_capacity(self) -> float:
+        return float(self._cluster.cpu_capacity[self.position])
+
+    @cpu_capacity.setter
+    def cpu_capacity(self, value: float):
+        self._cluster.cpu_capacity[self.position] = value
+
+    @property
+    def gpu_capacity(self) -> int:
+        return int(self._cluster.gpu_capacity[self.position])
+
+    @gpu_capacity.setter
+    def gpu_capacity(self, value: int):
+        self._cluster.gpu_capacity[self.position] = value
+
+    @property
+    def cpu_available(self) -> float:
+        return float(self._cluster.cpu_available[self.position])
+
+    @cpu_available.setter
+    def cpu_available(self, value: float):
+        self._cluster.cpu_available[self.position] = value
+
+    @property
+    def gpu_available(self) -> int:
+        return int(self._cluster.gpu_available[self.position])
+
+    @gpu_available.setter
+    def gpu_available(self, value: int):
+        self._cluster.gpu_available[self.position] = value
+
+class ArrayCluster(Cluster):
+    """
+    Struct-of-arrays cluster backend. Capacities and availability are kept in
+    contiguous NumPy arrays indexed by node position, so schedulers can score
+    every node in one vectorized operation. `nodes` still holds Node views.
+    """
+    vectorized = True
+
+    def __init__(self, cluster_config: Dict, verbose: bool=False):
+        num_nodes = cluster_size(cluster_config)
+        self.cpu_capacity = np.zeros(num_nodes, dtype=np.float64)
+        self.gpu_capacity = np.zeros(num_nodes, dtype=np.int64)
+        self.cpu_available = np.zeros(num_nodes, dtype=np.float64)
+        self.gpu_available = np.zeros(num_nodes, dtype=np.int64)
+        super().__init__(cluster_config, verbose)
+
+    def _create_node(self, position: int, id: str, cpu_capacity: float, gpu_capacity: int) -> Node:
+        return ArrayNode(self, position, id=id, cpu_capacity=cpu_capacity, gpu_capacity=gpu_capacity)
+
+    def fit_mask(self, task: Task) -> np.ndarray:
+        """Boolean mask of the nodes that can currently host the task."""
+        return (self.cpu_available >= task.cpu) & (self.gpu_available >= task.gpu)
+
+    def select_nodes_by_score(self, tasks: List[Task], place: Callable[[Task, str], None],
+                              score: Callable[..., np.ndarray]) -> List[Optional[str]]:
+        """
+        Batch placement for vectorized strategies: each task goes to the fitting node with
+        the lowest score(at, cpu, gpu), where `at` indexes the arrays (earliest node on ties).
+        Every distinct shape in the batch is scored against all nodes once; a placement only
+        changes one node, so the cached score arrays are then patched at that position.
+        """
+        scores: Dict[tuple, np.ndarray] = {}
+        node_ids = []
+        for task in tasks:
+            shape = (task.cpu, task.gpu)
+            masked = scores.get(shape)
+            if masked is None:
+                masked = scores[shape] = self._masked_score(score, slice(None), *shape)
+            position = int(masked.argmin())
+            if masked[position] == np.inf:
+                node_ids.append(None)
+                continue
+
+            node_id = self.nodes[position].id
+            place(task, node_id)
+            for (cpu, gpu), cached in scores.items():
+                cached[position] = self._masked_score(score, position, cpu, gpu)
+            node_ids.append(node_id)
+        return node_ids
+
+    def _masked_score(self, score: Callable[..., np.ndarray], at, cpu: float, gpu: int) -> np.ndarray:
+        fits = (self.cpu_available[at] >= cpu) & (self.gpu_available[at] >= gpu)
+        return np.where(fits, score(at, cpu, gpu), np.inf)
@@ -0,0 +1,40 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Tuple
+from core.node import Node
+
+class AvailabilityProfile:
+    """
+    A node's free resources over future time, as a step function built from the
+    end_times of its running tasks. Nothing new is assumed to start, so free CPU
+    and GPU only grow over time, and both queries are bisections on prefix sums
+    of the resources released up to each end time.
+
+    Profiles are snapshots: build a new one once the node changes.
+    """
+    def __init__(self, node: Node):
+        self.cpu_available = node.cpu_available
+        self.gpu_available = node.gpu_available
+        running = sorted(node.running_tasks, key=lambda task: task.end_time)
+        self.end_times: List[float] = [task.end_time for task in running]
+        self.freed_cpu: List[float] = list(accumulate(task.cpu for task in running))
+        self.freed_gpu: List[int] = list(accumulate(task.gpu for task in running))
+
+    def earliest_fit(self, cpu: float, gpu: int, now: float) -> float:
+        """Earliest time from `now` at which (cpu, gpu) is free, or inf if never."""
+        cpu_needed = cpu - self.cpu_available
+        gpu_needed = gpu - self.gpu_available
+        i = max(bisect_left(self.freed_cpu, cpu_needed) if cpu_needed > 0 else -1,
+                bisect_left(self.freed_gpu, gpu_needed) if gpu_needed > 0 else -1)
+        if i < 0:
+            return now
+        if i >= len(self.end_times):
+            return float('inf')
+        return max(self.end_times[i], now)
+
+    def free_at(self, time: float) -> Tuple[float, int]:
+        """Free (cpu, gpu) at `time`, counting tasks that end at or before it."""
+        i = bisect_right(self.end_times, time)
+        if i == 0:
+            return self.cpu_available, self.gpu_available
+        return self.cpu_available + self.freed_cpu[i - 1], self.gpu_available + self.freed_gpu[i - 1]
@@ -0,0 +1,76 @@
+import glob
+import math
+import os
+import pickle
+import queue
+import threading
+import zlib
+from typing import Dict, Optional
+
+CHECKPOINT_PATTERN = "checkpoint-*.ckpt"
+
+class Checkpointer:
+    """
+    Periodically snapshots Simulator state to `directory`.
+
+    A snapshot is taken every `every_ticks` event-loop iterations and/or every
+    `every_sim_ms` of simulated time. The state is pickled on the simulation
+    thread, so it is consistent but the simulation pauses for the pickling; only
+    compression (which releases the GIL) and the write run on a background thread.
+    Files are written atomically and only the newest `keep` snapshots are retained.
+    """
+    def __init__(self, directory: str, every_ticks: Optional[int]=None,
+                 every_sim_ms: Optional[float]=None, keep: int=2):
+        if not every_ticks and not every_sim_ms:
+            raise ValueError("Checkpointing needs every_ticks or every_sim_ms")
+        self.directory = directory
+        self.every_ticks = every_ticks
+        self.every_sim_ms = every_sim_ms
+        self.keep = keep
+        self.next_sim_time = float('-inf')
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=1)  # at most one snapshot waiting to be written
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def maybe_checkpoint(self, sim):
+        """Snapshot the simulator if a tick or simulated-time interval has elapsed."""
+        due = bool(self.every_ticks) and sim.ticks % self.every_ticks == 0
+        if self.every_sim_ms and sim.current_time >= self.next_sim_time:
+            self.next_sim_time = (math.floor(sim.current_time / self.every_sim_ms) + 1) * self.every_sim_ms
+            due = True
+        if due:
+            self.save(sim)
+
+    def save(self, sim):
+        payload = pickle.dumps(sim.snapshot_state(), protocol=pickle.HIGHEST_PROTOCOL)
+        path = os.path.join(self.directory, f"checkpoint-{sim.ticks:012d}.ckpt")
+        self._queue.put((path, payload))
+
+    def close(self):
+        """Wait for pending snapshots to be written and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, payload = item
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(payload, 1))
+            os.replace(tmp_path, path)
+            for old in sorted(glob.glob(os.path.join(self.directory, CHECKPOINT_PATTERN)))[:-self.keep]:
+                os.remove(old)
+
+def latest_checkpoint(directory: str) -> Optional[str]:
+    """Return the path of the newest snapshot in directory, or None."""
+    paths = sorted(glob.glob(os.path.join(directory, CHECKPOINT_PATTERN)))
+    return paths[-1] if paths else None
+
+def load_checkpoint(path: str) -> Dict:
+    with open(path, "rb") as f:
+        return pickle.loads(zlib.decompress(f.read()))
@@ -1,16 +1,154 @@
-from typing import List, Dict
+import logging
+import math
+from typing import List, Dict, Tuple
 from core.node import Node
+from core.task import Task
+
+GroupKey = Tuple[float, int]  # (cpu_capacity, gpu_capacity)
+
+logger = logging.getLogger(__name__)
+
+def node_pools(cluster_config: Dict) -> List[Dict]:
+    """
+    The cluster's node pools as dicts with name, count, node_cpu and node_gpu. A config
+    without `pools` describes a single pool of num_nodes identical nodes.
+    """
+    pools = cluster_config.get("pools")
+    if not pools:
+        return [{"name": "default", "count": cluster_config["num_nodes"],
+                 "node_cpu": cluster_config["node_cpu"], "node_gpu": cluster_config["node_gpu"]}]
+    return [
+        {"name": pool.get("name", f"pool-{i}"), "count": pool["count"],
+         "node_cpu": pool["node_cpu"], "node_gpu": pool["node_gpu"]}
+        for i, pool in enumerate(pools)
+    ]
+
+def cluster_size(cluster_config: Dict) -> int:
+    return sum(pool["count"] for pool in node_pools(cluster_config))
+
+class _ExactSum:
+    """
+    Running sum of floats without rounding drift. Like math.fsum it keeps the total
+    as non-overlapping partials (Shewchuk), but updated one term at a time, so a
+    value that is added and later subtracted leaves no residue.
+    """
+    __slots__ = ("partials",)
+
+    def __init__(self):
+        self.partials: List[float] = []
+
+    def add(self, x: float):
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def value(self) -> float:
+        return math.fsum(self.partials)
 
 class Cluster:
+    vectorized = False  # True for backends that expose availability as arrays
+
     def __init__(self, cluster_config: Dict, verbose: bool=False):
         self.nodes: List[Node] = []
-        for node_cnt in range(cluster_config["num_nodes"]):
-            node = Node(
-                id=f"n-{node_cnt}", 
-                cpu_capacity=cluster_config["node_cpu"], 
-                gpu_capacity=cluster_config["node_gpu"]
-            )
-            self.nodes.append(node)
+        self.pools = node_pools(cluster_config)
+        first_node = cluster_config.get("first_node", 0)  # offset of node IDs when this is a shard
+        node_cnt = 0
+        for pool in self.pools:
+            pool["start"] = node_cnt  # pools occupy contiguous positions
+            for _ in range(pool["count"]):
+                node = self._create_node(
+                    position=node_cnt,
+                    id=f"n-{first_node + node_cnt}", 
+                    cpu_capacity=pool["node_cpu"], 
+                    gpu_capacity=pool["node_gpu"]
+                )
+                self.nodes.append(node)
+                node_cnt += 1
+        self._fitting_ranges: Dict[Tuple[float, int], List[Tuple[int, int]]] = {}
+        self._nodes_by_id: Dict[str, Node] = {node.id: node for node in self.nodes}
+
+        # Aggregate capacity and usage, kept current through node_changed() so that
+        # utilization() does not visit every node. CPU is summed exactly, so the totals
+        # never drift from the per-node values. Groups are capacity classes (cpu_capacity, gpu_capacity).
+        self.total_cpu = sum(node.cpu_capacity for node in self.nodes)
+        self.total_gpu = sum(node.gpu_capacity for node in self.nodes)
+        self._used_cpu = _ExactSum()
+        self.used_gpu = 0
+        self.group_totals: Dict[GroupKey, List] = {}
+        self.group_used: Dict[GroupKey, List] = {}
+        self._node_usage: Dict[str, Tuple[float, int]] = {}
+        for node in self.nodes:
+            group = self.node_group(node)
+            totals = self.group_totals.setdefault(group, [0, 0])
+            totals[0] += node.cpu_capacity
+            totals[1] += node.gpu_capacity
+            self.group_used.setdefault(group, [_ExactSum(), 0])
+            self._node_usage[node.id] = (0.0, 0)
+            self.node_changed(node)
+            node.watchers.append(self)
+
+    def _create_node(self, position: int, id: str, cpu_capacity: float, gpu_capacity: int) -> Node:
+        return Node(id=id, cpu_capacity=cpu_capacity, gpu_capacity=gpu_capacity)
+
+    @staticmethod
+    def node_group(node: Node) -> "GroupKey":
+        return (node.cpu_capacity, node.gpu_capacity)
+
+    @property
+    def used_cpu(self) -> float:
+        return self._used_cpu.value()
+
+    def node_changed(self, node: Node):
+        """Fold a node's change in used resources into the aggregate counters."""
+        old_cpu, old_gpu = self._node_usage[node.id]
+        if node.running_tasks:
+            cpu_used = node.cpu_capacity - node.cpu_available
+            gpu_used = node.gpu_capacity - node.gpu_available
+        else:
+            cpu_used, gpu_used = 0.0, 0  # an idle node uses nothing, whatever rounding left in cpu_available
+        if (cpu_used, gpu_used) == (old_cpu, old_gpu):
+            return
+        self._node_usage[node.id] = (cpu_used, gpu_used)
+
+        group_used = self.group_used[self.node_group(node)]
+        for total in (self._used_cpu, group_used[0]):
+            total.add(cpu_used)
+            total.add(-old_cpu)
+        self.used_gpu += gpu_used - old_gpu
+        group_used[1] += gpu_used - old_gpu
+
+    def capacity_classes(self) -> List["GroupKey"]:
+        """Distinct (cpu_capacity, gpu_capacity) classes, fewest GPUs first."""
+        return sorted(self.group_totals, key=lambda group: (group[1], group[0]))
+
+    def fitting_ranges(self, task: Task) -> List[Tuple[int, int]]:
+        """
+        Position ranges [start, stop) of the pools whose nodes could ever host the
+        task, in position order. Cached per task shape.
+        """
+        shape = (task.cpu, task.gpu)
+        ranges = self._fitting_ranges.get(shape)
+        if ranges is None:
+            ranges = []
+            for pool in self.pools:
+                if pool["node_cpu"] < task.cpu or pool["node_gpu"] < task.gpu or not pool["count"]:
+                    continue
+                start, stop = pool["start"], pool["start"] + pool["count"]
+                if ranges and ranges[-1][1] == start:
+                    ranges[-1] = (ranges[-1][0], stop)
+                else:
+                    ranges.append((start, stop))
+            self._fitting_ranges[shape] = ranges
+        return ranges
 
     def get_all_nodes(self) -> List[Node]:
         return self.nodes
@@ -20,13 +158,35 @@ class Cluster:
         for node in self.nodes:
             node.release_completed_tasks(current_time)
 
+    def release_task(self, task: Task, current_time: float):
+        """Free a completed task on the node it was assigned to."""
+        self.get_node_by_id(task.assigned_node).release_task(task, current_time)
+
     def get_node_by_id(self, node_id: str) -> Node:
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        raise ValueError(f"Node with id '{node_id}' not found")
+        node = self._nodes_by_id.get(node_id)
+        if node is None:
+            raise ValueError(f"Node with id '{node_id}' not found")
+        return node
+
+    def utilization(self) -> Tuple[float, float]:
+        """Return the fraction of total CPU and GPU capacity currently in use."""
+        cpu_util = self.used_cpu / self.total_cpu if self.total_cpu else 0.0
+        gpu_util = self.used_gpu / self.total_gpu if self.total_gpu else 0.0
+        return cpu_util, gpu_util
+
+    def group_utilization(self) -> Dict["GroupKey", Tuple[float, float]]:
+        """Return utilization per capacity class."""
+        result = {}
+        for group, (total_cpu, total_gpu) in self.group_totals.items():
+            used_cpu, used_gpu = self.group_used[group]
+            result[group] = (
+                used_cpu.value() / total_cpu if total_cpu else 0.0,
+                used_gpu / total_gpu if total_gpu else 0.0
+            )
+        return result
 
     def report(self, verbose: bool):
+        if not verbose:
+            return
         for node in self.nodes:
-            if verbose:
-                print(node)
\ No newline at end of file
+            logger.debug(str(node))  # format now; buffered records are rendered later
\ No newline at end of file
@@ -0,0 +1,80 @@
+import heapq
+from typing import Iterator, List, Optional, Tuple
+from core.task import Task
+
+ARRIVAL = 0
+COMPLETION = 1
+
+class EventQueue:
+    """
+    Min-heap of simulation events ordered by (time, insertion order).
+    Each event is a (time, seq, kind, task, preemptions) tuple where kind is
+    ARRIVAL or COMPLETION. A completion event is stale once its task has been
+    preempted since it was pushed; stale events are dropped lazily when they
+    reach the top of the heap instead of being searched for and removed.
+
+    Events that are already due when the next time is looked up (zero-duration
+    tasks complete at the time they start) are moved to a second, small heap, so
+    the main heap's top is always the next time and is never scanned past.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, Task, int]] = []
+        self._due: List[Tuple[float, int, int, Task, int]] = []  # moved off _heap by next_time_after
+        self._seq = 0  # plain int rather than itertools.count so the queue pickles
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self._due) - self._stale
+
+    def push(self, time: float, kind: int, task: Task):
+        heapq.heappush(self._heap, (time, self._seq, kind, task, task.preemptions))
+        self._seq += 1
+
+    def mark_stale(self):
+        """One pushed completion event was superseded: its task was preempted."""
+        self._stale += 1
+
+    def _is_stale(self, event: Tuple[float, int, int, Task, int]) -> bool:
+        return event[2] == COMPLETION and event[4] != event[3].preemptions
+
+    def _drop_stale_top(self):
+        while self._stale and self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def pop_due(self, current_time: float) -> Iterator[Tuple[int, Task]]:
+        """
+        Pop every event whose time is <= current_time, in time order.
+        Events pushed while iterating are picked up if they are also due.
+        """
+        while True:
+            # Take the earlier of the two heaps' tops; seq is unique, so tuples never compare tasks
+            if self._due and (not self._heap or self._due[0] < self._heap[0]):
+                source = self._due
+            else:
+                source = self._heap
+            if not source or source[0][0] > current_time:
+                return
+            event = heapq.heappop(source)
+            if self._stale and self._is_stale(event):
+                self._stale -= 1
+                continue
+            yield event[2], event[3]
+
+    def next_time_after(self, current_time: float) -> Optional[float]:
+        """Return the earliest event time strictly greater than current_time, or None."""
+        # Zero-duration tasks can leave events at exactly current_time; they are
+        # released on the next tick, so set them aside and look past them.
+        while self._heap and self._heap[0][0] <= current_time:
+            event = heapq.heappop(self._heap)
+            if self._stale and self._is_stale(event):
+                self._stale -= 1
+            else:
+                heapq.heappush(self._due, event)
+        self._drop_stale_top()
+        next_time = self._heap[0][0] if self._heap else None
+        # Set-aside events are normally all due; one can only be later after time was moved back
+        for event in self._due:
+            if event[0] > current_time and (next_time is None or event[0] < next_time):
+                next_time = event[0]
+        return next_time
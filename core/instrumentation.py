@@ -0,0 +1,140 @@
+import cProfile
+import json
+import os
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+
+class Instrumentation:
+    """
+    Opt-in hot-path instrumentation for the Simulator.
+
+    Phase methods and the strategy's select_node/select_nodes are wrapped with timers
+    only when instrumentation is enabled, so a disabled run executes the original methods.
+    Optionally records a cProfile dump of the whole run and a Chrome trace
+    (chrome://tracing / Perfetto) with one span per phase call.
+    """
+    def __init__(self, chrome_trace_path: Optional[str]=None, profile_path: Optional[str]=None):
+        self.phase_time_ns: Dict[str, int] = {}
+        self.phase_calls: Dict[str, int] = {}
+        self.select_node_time_ns = 0
+        self.placement_attempts = 0
+        self.placement_successes = 0
+        self.pending_depth_histogram: Dict[int, int] = {}  # power-of-two upper bound -> ticks
+
+        self.chrome_trace_path = chrome_trace_path
+        self.profile_path = profile_path
+        self._trace_events: Optional[List[Dict]] = [] if chrome_trace_path else None
+        self._profiler = cProfile.Profile() if profile_path else None
+        self._origin_ns = perf_counter_ns()
+        self._in_batch = False  # select_node calls made by select_nodes are counted by the batch
+
+    def timed(self, phase: str, fn: Callable) -> Callable:
+        """Wrap fn so that each call is accumulated under the given phase."""
+        self.phase_time_ns.setdefault(phase, 0)
+        self.phase_calls.setdefault(phase, 0)
+        trace_events = self._trace_events
+        origin_ns = self._origin_ns
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            result = fn(*args, **kwargs)
+            elapsed = perf_counter_ns() - start
+            self.phase_time_ns[phase] += elapsed
+            self.phase_calls[phase] += 1
+            if trace_events is not None:
+                trace_events.append({"name": phase, "ph": "X", "pid": 0, "tid": 0,
+                                     "ts": (start - origin_ns) / 1000, "dur": elapsed / 1000})
+            return result
+        return wrapper
+
+    def timed_select_node(self, select_node: Callable) -> Callable:
+        """Wrap a strategy's select_node to time it and count attempts vs. successes."""
+        def wrapper(task):
+            if self._in_batch:
+                return select_node(task)
+            start = perf_counter_ns()
+            node_id = select_node(task)
+            self.select_node_time_ns += perf_counter_ns() - start
+            self.placement_attempts += 1
+            if node_id is not None:
+                self.placement_successes += 1
+            return node_id
+        return wrapper
+
+    def timed_select_nodes(self, select_nodes: Callable) -> Callable:
+        """
+        Wrap a strategy's select_nodes the same way, counting one attempt per task in
+        the batch. The time includes placing the chosen tasks.
+        """
+        def wrapper(tasks, place):
+            start = perf_counter_ns()
+            self._in_batch = True
+            try:
+                node_ids = select_nodes(tasks, place)
+            finally:
+                self._in_batch = False
+            self.select_node_time_ns += perf_counter_ns() - start
+            self.placement_attempts += len(tasks)
+            self.placement_successes += sum(node_id is not None for node_id in node_ids)
+            return node_ids
+        return wrapper
+
+    def counters(self) -> Dict:
+        """The accumulated times and counts, so a resumed run can continue them."""
+        return {
+            "phase_time_ns": dict(self.phase_time_ns),
+            "phase_calls": dict(self.phase_calls),
+            "select_node_time_ns": self.select_node_time_ns,
+            "placement_attempts": self.placement_attempts,
+            "placement_successes": self.placement_successes,
+            "pending_depth_histogram": dict(self.pending_depth_histogram),
+        }
+
+    def restore_counters(self, counters: Dict):
+        self.phase_time_ns.update(counters["phase_time_ns"])
+        self.phase_calls.update(counters["phase_calls"])
+        self.select_node_time_ns = counters["select_node_time_ns"]
+        self.placement_attempts = counters["placement_attempts"]
+        self.placement_successes = counters["placement_successes"]
+        self.pending_depth_histogram = dict(counters["pending_depth_histogram"])
+
+    def record_pending_depth(self, depth: int):
+        bucket = 1 << max(depth - 1, 0).bit_length()  # 0 and 1 share the first bucket
+        self.pending_depth_histogram[bucket] = self.pending_depth_histogram.get(bucket, 0) + 1
+
+    def start(self):
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def stop(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def summary(self) -> Dict:
+        return {
+            "phase_time_s": {phase: ns / 1e9 for phase, ns in self.phase_time_ns.items()},
+            "phase_calls": dict(self.phase_calls),
+            "select_node_time_s": self.select_node_time_ns / 1e9,
+            "placement_attempts": self.placement_attempts,
+            "placement_successes": self.placement_successes,
+            "pending_depth_histogram": {f"<={bucket}": n for bucket, n in sorted(self.pending_depth_histogram.items())},
+        }
+
+    def save(self, logs_dir: str):
+        """Write the summary as instrumentation.json plus any requested profile/trace dumps."""
+        with open(os.path.join(logs_dir, "instrumentation.json"), "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.profile_path)
+        if self._trace_events is not None:
+            with open(self.chrome_trace_path, "w") as f:
+                json.dump({"traceEvents": self._trace_events, "displayTimeUnit": "ms"}, f)
+
+    def print_summary(self):
+        summary = self.summary()
+        print("\nInstrumentation Summary:")
+        for phase, seconds in summary["phase_time_s"].items():
+            print(f"  - {phase}: {seconds:.3f}s over {summary['phase_calls'][phase]} calls")
+        print(f"  - select_node: {summary['select_node_time_s']:.3f}s, "
+              f"{summary['placement_successes']}/{summary['placement_attempts']} attempts placed")
+        print(f"  - pending depth histogram: {summary['pending_depth_histogram']}")
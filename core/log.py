@@ -0,0 +1,25 @@
+import logging
+import sys
+from logging.handlers import MemoryHandler
+from typing import Optional
+
+logger = logging.getLogger("core")
+_handler: Optional[MemoryHandler] = None
+
+def enable_verbose_logging(capacity: int=1024):
+    """
+    Print DEBUG messages from the core package to stdout, batched through a
+    memory buffer that is written out every `capacity` records.
+    """
+    global _handler
+    if _handler is None:
+        target = logging.StreamHandler(sys.stdout)
+        target.setFormatter(logging.Formatter("%(message)s"))
+        _handler = MemoryHandler(capacity, flushLevel=logging.WARNING, target=target)
+        logger.addHandler(_handler)
+        logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+def flush_logs():
+    if _handler is not None:
+        _handler.flush()
@@ -1,21 +1,46 @@
 import os
 import csv
-from typing import List, Dict
+import math
+import logging
+from typing import List, Dict, Optional, Tuple
 from core.task import Task
 from core.cluster import Cluster
+from core.sketch import QuantileSketch
 from statistics import median;
 
+logger = logging.getLogger(__name__)
+
+TASK_LOG_HEADER = ["id", "submit_time", "cpu", "gpu", "duration", "assigned_node", "start_time", "end_time", "wait_time", "turnaround_time"]
+
+def task_log_row(t: Task) -> list:
+    wait = t.first_start_time - t.submit_time
+    turnaround = t.end_time - t.submit_time
+    return [
+        t.id, t.submit_time, t.cpu, t.gpu, t.duration,
+        t.assigned_node, t.first_start_time, t.end_time, wait, turnaround
+    ]
+
 class MetricsCollector:
-    def __init__(self, total_tasks: int, algo: str):
+    def __init__(self, total_tasks: Optional[int], algo: str, logs_dir: Optional[str]=None,
+                 sample_interval: Optional[float]=None):
         self.completed_tasks: List[Task] = []
         self.cpu_usage_timeline: List[float] = []
         self.gpu_usage_timeline: List[float] = []
         self.time_ticks: List[float] = []
-        self.logs_dir = f"logs/{algo}"
-        self.total_tasks = total_tasks
+        self.logs_dir = logs_dir or f"logs/{algo}"
+        self.total_tasks = total_tasks  # None when the trace is streamed
+        # With a sample interval, utilization is only recorded at the first tick of
+        # each interval instead of at every event
+        self.sample_interval = sample_interval
+        self.next_sample_time = float('-inf')
+        self.preemptions = 0
 
         os.makedirs(self.logs_dir, exist_ok=True)
 
+    def open(self):
+        """Called once when a run starts (not on resume); collectors writing logs as they go open them here."""
+        pass
+
     def save_all_logs(self):
         self._save_summary_log()
         self._save_task_log()
@@ -31,14 +56,9 @@ class MetricsCollector:
     def _save_task_log(self):
         with open(f"{self.logs_dir}/task_log.csv", "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow(["id", "submit_time", "cpu", "gpu", "duration", "assigned_node", "start_time", "end_time", "wait_time", "turnaround_time"])
+            writer.writerow(TASK_LOG_HEADER)
             for t in self.completed_tasks:
-                wait = t.start_time - t.submit_time
-                turnaround = t.end_time - t.submit_time
-                writer.writerow([
-                    t.id, t.submit_time, t.cpu, t.gpu, t.duration,
-                    t.assigned_node, t.start_time, t.end_time, wait, turnaround
-                ])
+                writer.writerow(task_log_row(t))
 
     def _save_utilization_logs(self):
         with open(f"{self.logs_dir}/cpu_utilization.csv", "w", newline="") as f:
@@ -53,30 +73,43 @@ class MetricsCollector:
             for t, val in zip(self.time_ticks, self.gpu_usage_timeline):
                 writer.writerow([t, val])
 
-    def record_tick(self, cluster: Cluster, current_time: float):
-        total_cpu = sum(node.cpu_capacity for node in cluster.get_all_nodes())
-        used_cpu = sum(node.cpu_capacity - node.cpu_available for node in cluster.get_all_nodes())
-        cpu_util = used_cpu / total_cpu if total_cpu else 0.0
-
-        total_gpu = sum(node.gpu_capacity for node in cluster.get_all_nodes())
-        used_gpu = sum(node.gpu_capacity - node.gpu_available for node in cluster.get_all_nodes())
-        gpu_util = used_gpu / total_gpu if total_gpu else 0.0
+    def _take_sample(self, current_time: float) -> bool:
+        """Whether this tick should be written to the utilization timeline."""
+        if not self.sample_interval:
+            return True
+        if current_time < self.next_sample_time:
+            return False
+        self.next_sample_time = (math.floor(current_time / self.sample_interval) + 1) * self.sample_interval
+        return True
 
+    def record_tick(self, cluster: Cluster, current_time: float):
+        if not self._take_sample(current_time):
+            return
+        cpu_util, gpu_util = cluster.utilization()
         self.cpu_usage_timeline.append(cpu_util)
         self.gpu_usage_timeline.append(gpu_util)
         self.time_ticks.append(current_time)
 
+    def utilization_timeline(self) -> Tuple[List[float], List[float], List[float]]:
+        """Return the recorded (time, cpu_utilization, gpu_utilization) series."""
+        return self.time_ticks, self.cpu_usage_timeline, self.gpu_usage_timeline
+
     def record_task_completion(self, task: Task):
         self.completed_tasks.append(task)
-        compl = len(self.completed_tasks)
+        self._report_progress(len(self.completed_tasks))
+
+    def record_preemption(self, task: Task):
+        self.preemptions += 1
+
+    def _report_progress(self, compl: int):
         if compl % 100 == 0 or compl == self.total_tasks:
-            print(f"Completed {compl}/{self.total_tasks} tasks")
+            logger.info("Completed %d/%s tasks", compl, self.total_tasks or '?')
 
     def summary(self) -> Dict[str, float]:
         if not self.completed_tasks:
             return {}
 
-        wait_times = [t.start_time - t.submit_time for t in self.completed_tasks]
+        wait_times = [t.first_start_time - t.submit_time for t in self.completed_tasks]
         turnaround_times = [t.end_time - t.submit_time for t in self.completed_tasks]
 
         avg_wait = sum(wait_times) / len(wait_times)
@@ -89,7 +122,7 @@ class MetricsCollector:
         avg_cpu_util = sum(self.cpu_usage_timeline) / len(self.cpu_usage_timeline)
         avg_gpu_util = sum(self.gpu_usage_timeline) / len(self.gpu_usage_timeline)
 
-        return {
+        summary = {
             "avg_wait_time_ms": avg_wait,
             "median_wait_time_ms": median_wait,
             "avg_turnaround_time_ms": avg_turnaround,
@@ -98,9 +131,188 @@ class MetricsCollector:
             "avg_cpu_utilization": avg_cpu_util,
             "avg_gpu_utilization": avg_gpu_util
         }
+        if self.preemptions:
+            summary["tasks_preempted"] = self.preemptions
+        return summary
 
     def print_summary(self):
         print("\nMetrics Summary:")
         summary = self.summary()
         for k, v in summary.items():
-            print(f"  - {k}: {v:.2f}")
\ No newline at end of file
+            print(f"  - {k}: {v:.2f}")
+
+class StreamingMetricsCollector(MetricsCollector):
+    """
+    Constant-memory MetricsCollector for long traces.
+
+    Task and utilization rows are written to their CSV files through buffered
+    writers as they are recorded instead of being kept in memory. Average
+    utilization is the time-weighted integral over the simulated span (each
+    tick's value holds until the next tick), and wait/turnaround percentiles
+    come from mergeable QuantileSketches, so medians are approximate.
+    """
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, total_tasks: Optional[int], algo: str, logs_dir: Optional[str]=None,
+                 sample_interval: Optional[float]=None, relative_accuracy: float=0.01):
+        super().__init__(total_tasks, algo, logs_dir, sample_interval)
+        self.tasks_completed = 0
+        self.total_wait = 0.0
+        self.total_turnaround = 0.0
+        self.max_wait = float('-inf')
+        self.wait_sketch = QuantileSketch(relative_accuracy)
+        self.turnaround_sketch = QuantileSketch(relative_accuracy)
+
+        self.first_tick: Optional[float] = None
+        self.last_tick: Optional[float] = None
+        self.last_cpu_util = 0.0
+        self.last_gpu_util = 0.0
+        self.cpu_util_integral = 0.0
+        self.gpu_util_integral = 0.0
+
+        self._files = []
+        self._log_names: List[str] = []
+
+    def open(self):
+        self._task_writer = self._open_log("task_log.csv", TASK_LOG_HEADER)
+        self._cpu_writer = self._open_log("cpu_utilization.csv", ["time", "cpu_utilization"])
+        self._gpu_writer = self._open_log("gpu_utilization.csv", ["time", "gpu_utilization"])
+
+    def _open_log(self, name: str, header: List[str]):
+        f = open(f"{self.logs_dir}/{name}", "w", newline="", buffering=self.BUFFER_SIZE)
+        self._files.append(f)
+        self._log_names.append(name)
+        writer = csv.writer(f)
+        writer.writerow(header)
+        return writer
+
+    def __getstate__(self):
+        # Open files cannot be pickled; remember how far each log has been written instead
+        state = self.__dict__.copy()
+        for f in self._files:
+            f.flush()
+        state["_log_offsets"] = [f.tell() for f in self._files]
+        for key in ("_files", "_task_writer", "_cpu_writer", "_gpu_writer"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        offsets = state.pop("_log_offsets")
+        self.__dict__.update(state)
+        # Reopen the logs and drop anything written after the snapshot was taken
+        self._files = []
+        for name, offset in zip(self._log_names, offsets):
+            f = open(f"{self.logs_dir}/{name}", "r+", newline="", buffering=self.BUFFER_SIZE)
+            f.seek(offset)
+            f.truncate()
+            self._files.append(f)
+        # A collector pickled after save_all_logs() has no open logs left
+        writers = [csv.writer(f) for f in self._files]
+        self._task_writer, self._cpu_writer, self._gpu_writer = writers or (None, None, None)
+
+    @classmethod
+    def merge(cls, parts: List[Tuple["StreamingMetricsCollector", float, float]], algo: str,
+              logs_dir: Optional[str]=None) -> "StreamingMetricsCollector":
+        """
+        Combine finished collectors that each observed a disjoint slice of the cluster,
+        given as (collector, cpu_share, gpu_share) with each slice's fraction of the total
+        CPU and GPU capacity. Task logs stay with the parts; only the summary is merged.
+        """
+        relative_accuracy = parts[0][0].wait_sketch.relative_accuracy if parts else 0.01
+        merged = cls(None, algo, logs_dir, relative_accuracy=relative_accuracy)
+        for part, cpu_share, gpu_share in parts:
+            merged.tasks_completed += part.tasks_completed
+            merged.preemptions += part.preemptions
+            merged.total_wait += part.total_wait
+            merged.total_turnaround += part.total_turnaround
+            merged.max_wait = max(merged.max_wait, part.max_wait)
+            merged.wait_sketch.merge(part.wait_sketch)
+            merged.turnaround_sketch.merge(part.turnaround_sketch)
+            if part.last_tick is None:
+                continue
+
+            # A slice contributes nothing outside its own ticks, so the cluster-wide
+            # integral is the capacity-weighted sum over the merged time span
+            merged.cpu_util_integral += part.cpu_util_integral * cpu_share
+            merged.gpu_util_integral += part.gpu_util_integral * gpu_share
+            merged.last_cpu_util += part.last_cpu_util * cpu_share
+            merged.last_gpu_util += part.last_gpu_util * gpu_share
+            if merged.first_tick is None or part.first_tick < merged.first_tick:
+                merged.first_tick = part.first_tick
+            if merged.last_tick is None or part.last_tick > merged.last_tick:
+                merged.last_tick = part.last_tick
+        merged.total_tasks = merged.tasks_completed
+        return merged
+
+    def save_all_logs(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+        self._save_summary_log()
+
+    def record_tick(self, cluster: Cluster, current_time: float):
+        cpu_util, gpu_util = cluster.utilization()
+
+        if self.last_tick is None:
+            self.first_tick = current_time
+        else:
+            elapsed = current_time - self.last_tick
+            self.cpu_util_integral += self.last_cpu_util * elapsed
+            self.gpu_util_integral += self.last_gpu_util * elapsed
+        self.last_tick = current_time
+        self.last_cpu_util = cpu_util
+        self.last_gpu_util = gpu_util
+
+        if self._take_sample(current_time):
+            self._cpu_writer.writerow([current_time, cpu_util])
+            self._gpu_writer.writerow([current_time, gpu_util])
+
+    def record_task_completion(self, task: Task):
+        wait = task.first_start_time - task.submit_time
+        turnaround = task.end_time - task.submit_time
+        self.tasks_completed += 1
+        self.total_wait += wait
+        self.total_turnaround += turnaround
+        self.max_wait = max(self.max_wait, wait)
+        self.wait_sketch.add(wait)
+        self.turnaround_sketch.add(turnaround)
+
+        self._task_writer.writerow(task_log_row(task))
+        self._report_progress(self.tasks_completed)
+
+    def utilization_timeline(self) -> Tuple[List[float], List[float], List[float]]:
+        """Read the series back from the utilization logs, which must already be saved."""
+        series = []
+        for name in ("cpu_utilization.csv", "gpu_utilization.csv"):
+            with open(f"{self.logs_dir}/{name}", newline="") as f:
+                reader = csv.reader(f)
+                next(reader)
+                series.append([(float(t), float(v)) for t, v in reader])
+        time_ticks = [t for t, _ in series[0]]
+        return time_ticks, [v for _, v in series[0]], [v for _, v in series[1]]
+
+    def _average_utilization(self, integral: float, last_value: float) -> float:
+        span = self.last_tick - self.first_tick
+        return integral / span if span > 0 else last_value
+
+    def summary(self) -> Dict[str, float]:
+        if not self.tasks_completed:
+            return {}
+
+        summary = {
+            "avg_wait_time_ms": self.total_wait / self.tasks_completed,
+            "median_wait_time_ms": self.wait_sketch.quantile(0.5),
+            "p95_wait_time_ms": self.wait_sketch.quantile(0.95),
+            "p99_wait_time_ms": self.wait_sketch.quantile(0.99),
+            "avg_turnaround_time_ms": self.total_turnaround / self.tasks_completed,
+            "median_turnaround_time_ms": self.turnaround_sketch.quantile(0.5),
+            "p95_turnaround_time_ms": self.turnaround_sketch.quantile(0.95),
+            "p99_turnaround_time_ms": self.turnaround_sketch.quantile(0.99),
+            "max_wait_time_ms": self.max_wait,
+            "tasks_completed": self.tasks_completed,
+            "avg_cpu_utilization": self._average_utilization(self.cpu_util_integral, self.last_cpu_util),
+            "avg_gpu_utilization": self._average_utilization(self.gpu_util_integral, self.last_gpu_util)
+        }
+        if self.preemptions:
+            summary["tasks_preempted"] = self.preemptions
+        return summary
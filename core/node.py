@@ -1,6 +1,9 @@
-from typing import List
+import logging
+from typing import List, Optional, Tuple
 from core.task import Task
 
+logger = logging.getLogger(__name__)
+
 class Node:
     def __init__(self, id: str, cpu_capacity: float, gpu_capacity: int, verbose: bool=False):
         self.id = id
@@ -10,10 +13,15 @@ class Node:
         self.gpu_available = gpu_capacity
         self.running_tasks: List[Task] = []
         self.verbose = verbose
+        self.watchers: List = []  # notified through node_changed(node) when availability changes
 
-    def log(self, string: str):
+    def log(self, msg: str, *args):
         if self.verbose:
-            print(string)
+            logger.debug(msg, *args)
+
+    def _notify_watchers(self):
+        for watcher in self.watchers:
+            watcher.node_changed(self)
 
     def can_fit(self, task: Task) -> bool:
         """Check if the node can fit the task's CPU and GPU requirements."""
@@ -27,9 +35,12 @@ class Node:
         self.cpu_available -= task.cpu
         self.gpu_available -= task.gpu
         task.start_time = current_time
-        task.end_time = current_time + task.duration
+        task.end_time = current_time + task.work_left
+        if task.first_start_time is None:
+            task.first_start_time = current_time
         task.assigned_node = self.id
         self.running_tasks.append(task)
+        self._notify_watchers()
 
     def release_completed_tasks(self, current_time: float):
         """Release resources of tasks that have completed."""
@@ -38,11 +49,49 @@ class Node:
             if task.is_completed(current_time):
                 self.cpu_available += task.cpu
                 self.gpu_available += task.gpu
-                self.log(f"Task {task.id} completed on Node {self.id} by {current_time:.1f}s")
+                self.log("Task %s completed on Node %s by %.1fs", task.id, self.id, current_time)
             else:
                 still_running.append(task)
-                self.log(f"Task {task.id} still running on Node {self.id} by {current_time:.1f}s")
+                self.log("Task %s still running on Node %s by %.1fs", task.id, self.id, current_time)
+        released = len(still_running) != len(self.running_tasks)
         self.running_tasks = still_running
+        if released:
+            self._notify_watchers()
+
+    def release_task(self, task: Task, current_time: float):
+        """Release the resources held by a single completed task."""
+        self.running_tasks.remove(task)
+        self.cpu_available += task.cpu
+        self.gpu_available += task.gpu
+        self.log("Task %s completed on Node %s by %.1fs", task.id, self.id, current_time)
+        self._notify_watchers()
+
+    def unassign_task(self, task: Task, available: Optional[Tuple[float, int]]=None):
+        """
+        Undo assign_task() for a task that never ran, e.g. a gang member rolled back.
+        When undoing the node's latest assignments in reverse order, pass the (cpu, gpu)
+        available before this one to restore it exactly rather than by float addition.
+        """
+        if task.remaining is None:
+            task.first_start_time = None  # this assignment was its first start
+        self._detach(task, available)
+
+    def preempt_task(self, task: Task, current_time: float):
+        """Evict a running task; it keeps its first start time and records the work left."""
+        task.remaining = task.end_time - current_time
+        self._detach(task)
+
+    def _detach(self, task: Task, available: Optional[Tuple[float, int]]=None):
+        self.running_tasks.remove(task)
+        if available is None:
+            self.cpu_available += task.cpu
+            self.gpu_available += task.gpu
+        else:
+            self.cpu_available, self.gpu_available = available
+        task.start_time = None
+        task.end_time = None
+        task.assigned_node = None
+        self._notify_watchers()
 
     def __str__(self):
         return f"<Node {self.id}: CPU {self.cpu_available}/{self.cpu_capacity}, GPU {self.gpu_available}/{self.gpu_capacity}>"
\ No newline at end of file
@@ -0,0 +1,74 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from sortedcontainers import SortedList
+from core.node import Node
+from core.task import Task
+
+ClassKey = Tuple[float, int]  # (cpu_capacity, gpu_capacity)
+
+class NodeIndex:
+    """
+    Incrementally maintained index of nodes by remaining resources.
+
+    Nodes are grouped by capacity class (cpu_capacity, gpu_capacity), then
+    bucketed by gpu_available, and each bucket is kept sorted by (cpu_available,
+    position in the cluster). Classes that could never host a task are skipped
+    without looking at their buckets, and inside a bucket every fit score used by
+    the schedulers is monotone in cpu_available, so the best fitting node of a
+    bucket is found with a single bisection.
+    """
+    def __init__(self, nodes: List[Node]):
+        self.nodes = nodes
+        self._position: Dict[str, int] = {}
+        self._classes: Dict[ClassKey, Dict[int, SortedList]] = {}
+        self._entries: Dict[str, Tuple[int, Tuple[float, int]]] = {}
+
+        for position, node in enumerate(nodes):
+            self._position[node.id] = position
+            self._classes.setdefault((node.cpu_capacity, node.gpu_capacity), {})
+            self._insert(node)
+            node.watchers.append(self)
+        # Fewest GPUs first, so CPU-only tasks are offered CPU-only hosts before GPU machines
+        self._class_order: List[Tuple[ClassKey, Dict[int, SortedList]]] = sorted(
+            self._classes.items(), key=lambda item: (item[0][1], item[0][0])
+        )
+
+    def _insert(self, node: Node):
+        buckets = self._classes[(node.cpu_capacity, node.gpu_capacity)]
+        entry = (node.cpu_available, self._position[node.id])
+        bucket = buckets.get(node.gpu_available)
+        if bucket is None:
+            bucket = buckets[node.gpu_available] = SortedList()
+        bucket.add(entry)
+        self._entries[node.id] = (node.gpu_available, entry)
+
+    def node_changed(self, node: Node):
+        """Re-index a node after its availability changed."""
+        gpu_available, entry = self._entries.pop(node.id)
+        buckets = self._classes[(node.cpu_capacity, node.gpu_capacity)]
+        bucket = buckets[gpu_available]
+        bucket.remove(entry)
+        if not bucket:
+            del buckets[gpu_available]
+        self._insert(node)
+
+    def position(self, node: Node) -> int:
+        return self._position[node.id]
+
+    def candidates(self, task: Task, exclude: Optional[int]=None) -> Iterator[Node]:
+        """
+        Yield, for every bucket with enough GPUs in a capacity class that could fit
+        the task, the fitting node with the least available CPU (lowest cluster
+        position on ties). The node at position `exclude`, if given, is passed over.
+        """
+        probe = (task.cpu, -1)
+        for (cpu_capacity, gpu_capacity), buckets in self._class_order:
+            if gpu_capacity < task.gpu or cpu_capacity < task.cpu:
+                continue
+            for gpu_available, bucket in buckets.items():
+                if gpu_available < task.gpu:
+                    continue
+                i = bucket.bisect_left(probe)
+                if i < len(bucket) and bucket[i][1] == exclude:
+                    i += 1
+                if i < len(bucket):
+                    yield self.nodes[bucket[i][1]]
@@ -0,0 +1,124 @@
+import heapq
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, Tuple
+from sortedcontainers import SortedList
+from core.task import Task
+
+Shape = Tuple[float, int]  # (cpu, gpu) request
+BucketKey = Tuple[int, float, int]  # (priority, cpu, gpu)
+
+def bucket_key(task: Task) -> BucketKey:
+    return (task.priority, task.cpu, task.gpu)
+
+class PendingQueue:
+    """
+    Queue of tasks waiting for capacity, bucketed by priority and resource shape.
+    Higher priorities go first; within a priority, tasks go in arrival order.
+
+    When a placement attempt fails for a shape, no node can currently fit it, and
+    neither can any shape requesting at least as much CPU and GPU at the same or a
+    lower priority (with preemption, a lower priority can evict less). Those are
+    skipped until capacity_freed() is called, so a saturated cluster does not
+    re-probe every waiting task on every event. A failed attempt only blocks when
+    the strategy says the refusal was about the shape (see place_ready).
+
+    Blocked shapes are indexed by GPU count, and per GPU count only the frontier
+    of blocked (cpu, priority) pairs is kept: sorted by cpu, with priority rising
+    along it, since any pair with more CPU and no higher priority adds nothing.
+    A lookup is then one bisection per GPU count.
+    """
+    def __init__(self):
+        self._buckets: Dict[BucketKey, Deque[Tuple[int, int, Task]]] = {}
+        self._blocked: Dict[int, SortedList] = {}  # gpu -> frontier of blocked (cpu, priority)
+        self._seq = 0  # plain int rather than itertools.count so the queue pickles
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Task]:
+        """Iterate waiting tasks in the order they would be offered for placement."""
+        for _, _, task in heapq.merge(*self._buckets.values(), key=lambda entry: entry[:2]):
+            yield task
+
+    def demand(self) -> Shape:
+        """Total (cpu, gpu) requested by the waiting tasks."""
+        cpu = sum(key[1] * len(bucket) for key, bucket in self._buckets.items())
+        gpu = sum(key[2] * len(bucket) for key, bucket in self._buckets.items())
+        return cpu, gpu
+
+    def min_priority(self) -> int:
+        return min(key[0] for key in self._buckets)
+
+    def push(self, task: Task):
+        key = bucket_key(task)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+        bucket.append((-task.priority, self._seq, task))
+        self._seq += 1
+        self._size += 1
+
+    def capacity_freed(self):
+        """Resources were released, so every shape is worth retrying."""
+        self._blocked.clear()
+
+    def block(self, task: Task):
+        """The task could not be placed, so neither can any task it dominates."""
+        self._block(bucket_key(task))
+
+    def _block(self, key: BucketKey):
+        if self._is_blocked(key):
+            return
+        priority, cpu, gpu = key
+        frontier = self._blocked.get(gpu)
+        if frontier is None:
+            frontier = self._blocked[gpu] = SortedList()
+        i = frontier.bisect_left((cpu, priority))
+        # Drop the pairs the new one dominates: equal CPU before it, more CPU after it
+        while i > 0 and frontier[i - 1][0] == cpu:
+            del frontier[i - 1]
+            i -= 1
+        while i < len(frontier) and frontier[i][1] <= priority:
+            del frontier[i]
+        frontier.add((cpu, priority))
+
+    def is_blocked(self, task: Task) -> bool:
+        return self._is_blocked(bucket_key(task))
+
+    def _is_blocked(self, key: BucketKey) -> bool:
+        priority, cpu, gpu = key
+        for b_gpu, frontier in self._blocked.items():
+            if b_gpu > gpu:
+                continue
+            # The last pair with at most this much CPU has the highest priority among them
+            i = frontier.bisect_right((cpu, float('inf')))
+            if i and frontier[i - 1][1] >= priority:
+                return True
+        return False
+
+    def place_ready(self, place: Callable[[Task], bool], blocks_shape: Callable[[Task], bool]=lambda task: True):
+        """
+        Offer waiting tasks to place() in queue order, skipping blocked buckets.
+        A task leaves the queue when place() returns True; a False return blocks its
+        bucket if blocks_shape(task) agrees, and otherwise skips it for this pass.
+        """
+        heads = [bucket[0][:2] + (key,) for key, bucket in self._buckets.items() if not self._is_blocked(key)]
+        heapq.heapify(heads)
+
+        while heads:
+            key = heapq.heappop(heads)[2]
+            if self._is_blocked(key):
+                continue
+            bucket = self._buckets[key]
+            if not place(bucket[0][2]):
+                if blocks_shape(bucket[0][2]):
+                    self._block(key)
+                continue
+
+            bucket.popleft()
+            self._size -= 1
+            if bucket:
+                heapq.heappush(heads, bucket[0][:2] + (key,))
+            else:
+                del self._buckets[key]
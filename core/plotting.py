@@ -0,0 +1,30 @@
+import os
+from core.metrics import MetricsCollector
+
+def plot_utilization(metrics: MetricsCollector, show: bool=False):
+    """
+    Save CPU and GPU utilization plots to <logs_dir>/plots from the collected
+    metrics. matplotlib is imported here, and only here, with the non-interactive
+    Agg backend unless the plots are also to be shown.
+    """
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plots_dir = os.path.join(metrics.logs_dir, "plots")
+    os.makedirs(plots_dir, exist_ok=True)
+    time_ticks, cpu_util, gpu_util = metrics.utilization_timeline()
+
+    for name, values, color in (("CPU", cpu_util, "blue"), ("GPU", gpu_util, "green")):
+        plt.figure(figsize=(10, 4))
+        plt.plot(time_ticks, values, label=f"{name} Utilization", color=color)
+        plt.title(f"{name} Utilization Over Time")
+        plt.xlabel("Time (ms)")
+        plt.ylabel(f"{name} Utilization")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig(f"{plots_dir}/{name.lower()}_utilization_plot.png")
+        if show:
+            plt.show()
+        plt.close()
@@ -0,0 +1,129 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+from sortedcontainers import SortedList
+from core.cluster import Cluster
+from core.node import Node
+from core.task import Task
+
+class Preemptor:
+    """
+    Chooses which running tasks to evict so that a higher-priority task fits.
+
+    Running tasks are indexed per node and per priority class, each class sorted
+    by start time, together with the CPU/GPU each class holds on the node. A node
+    is ruled out in O(priority classes) when evicting everything below the task's
+    priority would still not make room; otherwise victims are taken from the
+    lowest class up, most recently started first, so the least work is lost.
+    For each priority class, the nodes running tasks of that class are also kept
+    in cluster order, so only nodes that hold something evictable are examined.
+    The simulator reports every start and stop through started()/stopped().
+    """
+    def __init__(self, cluster: Cluster):
+        self.cluster = cluster
+        # node ID -> priority -> tasks ordered by (start_time, seq)
+        self._running: Dict[str, Dict[int, SortedList]] = {node.id: {} for node in cluster.nodes}
+        # node ID -> priority -> [cpu, gpu] held by that class
+        self._usage: Dict[str, Dict[int, List]] = {node.id: {} for node in cluster.nodes}
+        # id(task) -> its index entry; trace IDs need not be unique, and a running task stays alive
+        self._entries: Dict[int, Tuple[float, int, Task]] = {}
+        self._seq = 0
+        self._position: Dict[str, int] = {node.id: i for i, node in enumerate(cluster.nodes)}
+        self._holders: Dict[int, SortedList] = {}  # priority -> positions of nodes running that class
+
+    def __getstate__(self):
+        # id() keys do not survive pickling; the entries are rebuilt from _running on load
+        state = self.__dict__.copy()
+        del state["_entries"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._entries = {
+            id(entry[2]): entry
+            for classes in self._running.values() for entries in classes.values() for entry in entries
+        }
+
+    def started(self, task: Task):
+        entry = (task.start_time, self._seq, task)  # seq is unique, so tasks are never compared
+        self._seq += 1
+        self._entries[id(task)] = entry
+        classes = self._running[task.assigned_node]
+        if task.priority not in classes:
+            classes[task.priority] = SortedList()
+            self._holders.setdefault(task.priority, SortedList()).add(self._position[task.assigned_node])
+        classes[task.priority].add(entry)
+        usage = self._usage[task.assigned_node].setdefault(task.priority, [0.0, 0])
+        usage[0] += task.cpu
+        usage[1] += task.gpu
+
+    def stopped(self, task: Task):
+        """The task completed or was evicted; call before its assignment is cleared."""
+        entry = self._entries.pop(id(task))
+        classes = self._running[task.assigned_node]
+        classes[task.priority].remove(entry)
+        usage = self._usage[task.assigned_node][task.priority]
+        usage[0] -= task.cpu
+        usage[1] -= task.gpu
+        if not classes[task.priority]:
+            del classes[task.priority]
+            del self._usage[task.assigned_node][task.priority]
+            holders = self._holders[task.priority]
+            holders.remove(self._position[task.assigned_node])
+            if not holders:
+                del self._holders[task.priority]
+
+    def _victims_on(self, node: Node, task: Task, current_time: float) -> Optional[Tuple[Tuple, List[Task]]]:
+        cpu_needed = task.cpu - node.cpu_available
+        gpu_needed = task.gpu - node.gpu_available
+        if cpu_needed <= 0 and gpu_needed <= 0:
+            return None  # it already fits; the strategy declined this node for its own reasons
+        usage = self._usage[node.id]
+        lower = sorted(priority for priority in usage if priority < task.priority)
+        if cpu_needed > sum(usage[p][0] for p in lower) or gpu_needed > sum(usage[p][1] for p in lower):
+            return None
+
+        victims = []
+        lost_work = 0.0
+        classes = self._running[node.id]
+        for priority in lower:
+            for _, _, victim in reversed(classes[priority]):
+                if cpu_needed <= 0 and gpu_needed <= 0:
+                    break
+                # Only evict tasks that free something still missing
+                if (cpu_needed > 0 and victim.cpu > 0) or (gpu_needed > 0 and victim.gpu > 0):
+                    victims.append(victim)
+                    lost_work += current_time - victim.start_time
+                    cpu_needed -= victim.cpu
+                    gpu_needed -= victim.gpu
+            if cpu_needed <= 0 and gpu_needed <= 0:
+                cost = (victims[-1].priority, lost_work, len(victims))
+                return cost, victims
+        return None
+
+    def _candidates(self, priority: int) -> Iterator[Node]:
+        """Nodes running any task below the given priority, in cluster order."""
+        lower = [holders for p, holders in self._holders.items() if p < priority]
+        last = None
+        for position in heapq.merge(*lower):
+            if position != last:
+                last = position
+                yield self.cluster.nodes[position]
+
+    def find_victims(self, task: Task, current_time: float) -> Optional[Tuple[Node, List[Task]]]:
+        """
+        Return a node and lower-priority running tasks to evict from it so the task
+        fits, or None. Victims are picked greedily per node as described above, and
+        nodes are compared by cost: the highest evicted priority, then the work lost,
+        then the number of victims; earlier nodes win ties. The greedy pick keeps this
+        cheap but is not guaranteed to find the cheapest possible set on a node.
+        """
+        best = None
+        for node in self._candidates(task.priority):
+            if node.cpu_capacity < task.cpu or node.gpu_capacity < task.gpu:
+                continue
+            found = self._victims_on(node, task, current_time)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = (found[0], node, found[1])
+        if best is None:
+            return None
+        return best[1], best[2]
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from core.task import Task
 from algorithms.base import ISchedulerAlgorithm
 
@@ -5,15 +6,49 @@ class Scheduler:
     def __init__(self, strategy: ISchedulerAlgorithm):
         self.strategy = strategy
 
-    def schedule(self, task: Task, current_time: float) -> str:
+    def schedule(self, task: Task, current_time: float) -> Optional[str]:
         """
         Attempt to schedule a task using the chosen strategy.
-        Returns the ID of the assigned node or raises an exception.
+        Returns the ID of the assigned node, or None if no suitable node was found.
         """
+        self.strategy.now = current_time
         assigned_node_id = self.strategy.select_node(task)
         if assigned_node_id is None:
-            raise RuntimeError(f"No suitable node found for Task {task.id}")
+            return None
 
         node = self.strategy.cluster.get_node_by_id(assigned_node_id)
         node.assign_task(task, current_time)
-        return assigned_node_id
\ No newline at end of file
+        return assigned_node_id
+
+    def schedule_batch(self, tasks: List[Task], current_time: float) -> List[Optional[str]]:
+        """
+        Attempt to schedule a batch of tasks in order with one strategy call.
+        Returns the assigned node ID per task, None for tasks that did not fit.
+        """
+        def place(task: Task, node_id: str):
+            self.strategy.cluster.get_node_by_id(node_id).assign_task(task, current_time)
+
+        self.strategy.now = current_time
+        return self.strategy.select_nodes(tasks, place)
+
+    def schedule_gang(self, tasks: List[Task], current_time: float) -> Optional[List[str]]:
+        """
+        All-or-nothing placement of the instances of a multi-instance job.
+        Returns the node ID per task, or None (with nothing assigned) if any instance did not fit.
+        Strategy-internal state, such as the round-robin cursor, is not rewound on failure.
+        """
+        cluster = self.strategy.cluster
+        placed = []  # (task, node, its availability before the task)
+        def place(task: Task, node_id: str):
+            node = cluster.get_node_by_id(node_id)
+            placed.append((task, node, (node.cpu_available, node.gpu_available)))
+            node.assign_task(task, current_time)
+
+        self.strategy.now = current_time
+        node_ids = self.strategy.select_nodes(tasks, place)
+        if any(node_id is None for node_id in node_ids):
+            # Undo in reverse so every node gets back exactly what it had
+            for task, node, available in reversed(placed):
+                node.unassign_task(task, available)
+            return None
+        return node_ids
@@ -0,0 +1,288 @@
+"""
+Sharded simulation: the cluster's nodes are split into contiguous partitions
+(racks, or node pools), each simulated by its own Simulator in a worker process.
+
+A dispatcher in the parent routes every arriving task to one shard through a
+pluggable ShardDispatchPolicy. Shards never exchange tasks; they only
+synchronise at simulated-time barriers every `barrier_ms`, where each one
+reports its load so the policy can route the next window. Tasks cannot move
+between shards once routed, so results are an approximation of the
+single-process run (exact with one shard).
+"""
+import io
+import logging
+import multiprocessing
+import os
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from core.task import Task
+from core.cluster import cluster_size, node_pools
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from core.metrics import StreamingMetricsCollector
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ShardState:
+    """What the dispatcher knows about a shard: its node classes, and its load as of the last barrier."""
+    index: int
+    num_nodes: int
+    classes: List[Tuple[float, int]]  # (node_cpu, node_gpu) of each pool in the shard
+    free_cpu: float = 0.0
+    free_gpu: int = 0
+    queued_cpu: float = 0.0
+    queued_gpu: int = 0
+    routed_cpu: float = 0.0   # dispatched since the last barrier
+    routed_gpu: int = 0
+
+    def can_host(self, task: Task) -> bool:
+        return any(task.cpu <= cpu and task.gpu <= gpu for cpu, gpu in self.classes)
+
+    def headroom(self) -> Tuple[int, float]:
+        """Estimated spare (gpu, cpu) once queued and newly routed work is placed."""
+        return (self.free_gpu - self.queued_gpu - self.routed_gpu,
+                self.free_cpu - self.queued_cpu - self.routed_cpu)
+
+class ShardDispatchPolicy(ABC):
+    @abstractmethod
+    def route(self, task: Task, shards: List[ShardState]) -> int:
+        """Return the index (into `shards`) of the shard to send the task to. All shards can host it."""
+        pass
+
+class RoundRobinDispatch(ShardDispatchPolicy):
+    def __init__(self):
+        self.counter = 0
+
+    def route(self, task: Task, shards: List[ShardState]) -> int:
+        choice = self.counter % len(shards)
+        self.counter += 1
+        return choice
+
+class HashDispatch(ShardDispatchPolicy):
+    """Stable routing by task ID, independent of load and of arrival order."""
+    def route(self, task: Task, shards: List[ShardState]) -> int:
+        return zlib.crc32(task.id.encode()) % len(shards)
+
+class LeastLoadedDispatch(ShardDispatchPolicy):
+    """Send each task to the shard with the most estimated headroom (GPU first for GPU tasks)."""
+    def route(self, task: Task, shards: List[ShardState]) -> int:
+        def key(i: int):
+            gpu_headroom, cpu_headroom = shards[i].headroom()
+            return (gpu_headroom, cpu_headroom) if task.gpu else (cpu_headroom,)
+        return max(range(len(shards)), key=key)  # earliest shard on ties
+
+DISPATCH_POLICIES = {
+    "round_robin": RoundRobinDispatch,
+    "hash": HashDispatch,
+    "least_loaded": LeastLoadedDispatch,
+}
+
+def get_dispatch_policy(name: str) -> ShardDispatchPolicy:
+    policy = DISPATCH_POLICIES.get(name.lower())
+    if policy is None:
+        raise ValueError(f"Unknown dispatch policy: {name}")
+    return policy()
+
+def partition_cluster(cluster_config: Dict, num_shards: int) -> List[Dict]:
+    """
+    Split a cluster config into `num_shards` configs of contiguous nodes (pools are
+    cut where a shard boundary falls inside them), keeping global node IDs.
+    """
+    pools = node_pools(cluster_config)
+    num_nodes = sum(pool["count"] for pool in pools)
+    if not 1 <= num_shards <= num_nodes:
+        raise ValueError(f"Cannot split {num_nodes} nodes into {num_shards} shards")
+    configs = []
+    first_node = 0
+    pool_index, taken = 0, 0  # nodes of pools[pool_index] already given to earlier shards
+    for i in range(num_shards):
+        size = num_nodes // num_shards + (1 if i < num_nodes % num_shards else 0)
+        shard_pools = []
+        remaining = size
+        while remaining:
+            pool = pools[pool_index]
+            count = min(pool["count"] - taken, remaining)
+            if count:
+                shard_pools.append(dict(pool, count=count))
+            remaining -= count
+            taken += count
+            if taken == pool["count"]:
+                pool_index, taken = pool_index + 1, 0
+        config = {key: value for key, value in cluster_config.items() if key not in ("num_nodes", "node_cpu", "node_gpu")}
+        configs.append(dict(config, pools=shard_pools, first_node=first_node))
+        first_node += size
+    return configs
+
+class _Feed:
+    """Arrival source that can be refilled after it has run dry."""
+    def __init__(self):
+        self.tasks: Deque[Task] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Task:
+        if not self.tasks:
+            raise StopIteration
+        return self.tasks.popleft()
+
+def _shard_load(sim: Simulator) -> Dict:
+    cluster = sim.cluster
+    queued_cpu, queued_gpu = sim.pending_tasks.demand()
+    return {
+        "free_cpu": cluster.total_cpu - cluster.used_cpu,
+        "free_gpu": cluster.total_gpu - cluster.used_gpu,
+        "queued_cpu": queued_cpu,
+        "queued_gpu": queued_gpu,
+    }
+
+def _shard_worker(conn, cluster_config: Dict, config: Dict):
+    """Simulate one shard, advancing to each barrier the dispatcher sends."""
+    from main import get_algorithm, get_cluster  # the cluster and algorithm factories live in main.py
+    logging.getLogger("core").setLevel(logging.WARNING)  # progress lines from every shard would interleave
+
+    cluster = get_cluster(cluster_config)
+    scheduler = Scheduler(strategy=get_algorithm(config["algorithm"], cluster))
+    feed = _Feed()
+    sim = Simulator(cluster, scheduler, feed, config)
+    last_step: Optional[float] = None
+    sim.start()
+
+    while True:
+        message, tasks, barrier = conn.recv()
+        if tasks:
+            feed.tasks.extend(tasks)
+            if sim.arrivals_drained:
+                sim._push_next_arrival()
+                if last_step is not None:
+                    # Time was advanced without knowing about this arrival; redo that step
+                    sim.current_time = sim.events.next_time_after(last_step)
+        if message == "finish":
+            break
+        # Handle everything before the barrier; with no events left, wait for more arrivals
+        while sim.events and sim.current_time < barrier:
+            last_step = sim.current_time
+            sim.step()
+        conn.send(_shard_load(sim))
+
+    while sim.has_work():
+        sim.step()
+    with redirect_stdout(io.StringIO()):
+        sim.finish()
+    conn.send(sim.metrics)
+    conn.close()
+
+class ShardedSimulator:
+    """
+    Drop-in for Simulator.run() on large clusters: partitions the nodes into
+    `shards` worker processes and merges their metrics into one summary.
+    Per-shard task and utilization logs are written to <logs_dir>/shard-<i>.
+    """
+    def __init__(self, cluster_config: Dict, tasks: Iterable[Task], config: Dict):
+        sharding = config.get("sharding") or {}
+        self.shard_configs = partition_cluster(cluster_config, sharding.get("shards", 1))
+        self.policy = get_dispatch_policy(sharding.get("policy", "least_loaded"))
+        self.barrier_ms = float(sharding.get("barrier_ms", 60000))
+        if isinstance(tasks, list):
+            tasks = sorted(tasks, key=lambda t: t.submit_time)
+        self.tasks = tasks
+        self.algorithm = config["algorithm"]
+        self.logs_dir = config.get("logs_dir") or f"logs/{self.algorithm}"
+        self.shard_config = {
+            "algorithm": self.algorithm,
+            "verbose": False,
+            "headless": True,
+            "streaming_metrics": True,  # constant-memory and mergeable
+            "utilization_sample_ms": config.get("utilization_sample_ms"),
+            "preemption": config.get("preemption", False),
+        }
+        self.shards = [
+            ShardState(index=i, num_nodes=cluster_size(c),
+                       classes=[(pool["node_cpu"], pool["node_gpu"]) for pool in c["pools"]])
+            for i, c in enumerate(self.shard_configs)
+        ]
+        self.metrics: Optional[StreamingMetricsCollector] = None
+        self.wall_time_s: Optional[float] = None
+
+    def _route(self, task: Task) -> int:
+        eligible = [shard for shard in self.shards if shard.can_host(task)]
+        if not eligible:
+            raise ValueError(f"Task {task.id} does not fit on any node of any shard")
+        shard = eligible[self.policy.route(task, eligible)]
+        shard.routed_cpu += task.cpu
+        shard.routed_gpu += task.gpu
+        return shard.index
+
+    def _windows(self) -> Iterable[Tuple[float, List[List[Task]]]]:
+        """Yield (barrier, tasks per shard) for each barrier window that has arrivals."""
+        batches: List[List[Task]] = [[] for _ in self.shards]
+        barrier = None
+        for task in self.tasks:
+            if barrier is not None and task.submit_time >= barrier:
+                yield barrier, batches
+                batches = [[] for _ in self.shards]
+                barrier = None
+            if barrier is None:
+                barrier = (task.submit_time // self.barrier_ms + 1) * self.barrier_ms
+            batches[self._route(task)].append(task)
+        if barrier is not None:
+            yield barrier, batches
+
+    def run(self):
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+
+        start = time.perf_counter()
+        conns, workers = [], []
+        for i, cluster_config in enumerate(self.shard_configs):
+            parent_conn, child_conn = context.Pipe()
+            config = dict(self.shard_config, logs_dir=os.path.join(self.logs_dir, f"shard-{i}"))
+            worker = context.Process(target=_shard_worker, args=(child_conn, cluster_config, config))
+            worker.start()
+            child_conn.close()
+            conns.append(parent_conn)
+            workers.append(worker)
+
+        try:
+            for barrier, batches in self._windows():
+                for conn, batch in zip(conns, batches):
+                    conn.send(("advance", batch, barrier))
+                for conn, shard in zip(conns, self.shards):  # the barrier: wait for every shard
+                    for key, value in conn.recv().items():
+                        setattr(shard, key, value)
+                    shard.routed_cpu = 0.0
+                    shard.routed_gpu = 0
+            for conn in conns:
+                conn.send(("finish", None, None))
+            parts = [conn.recv() for conn in conns]
+        except BaseException:
+            for worker in workers:  # they would otherwise wait for the next barrier forever
+                worker.terminate()
+            raise
+        finally:
+            for worker in workers:
+                worker.join()
+        self.wall_time_s = time.perf_counter() - start
+
+        capacities = [
+            (sum(pool["count"] * pool["node_cpu"] for pool in c["pools"]),
+             sum(pool["count"] * pool["node_gpu"] for pool in c["pools"]))
+            for c in self.shard_configs
+        ]
+        total_cpu = sum(cpu for cpu, _ in capacities)
+        total_gpu = sum(gpu for _, gpu in capacities)
+        self.metrics = StreamingMetricsCollector.merge([
+            (part, cpu / total_cpu if total_cpu else 0.0, gpu / total_gpu if total_gpu else 0.0)
+            for part, (cpu, gpu) in zip(parts, capacities)
+        ], self.algorithm, self.logs_dir)
+        self.metrics.print_summary()
+        self.metrics.save_all_logs()
+        logger.info("Simulated %d shards in %.2fs", len(self.shards), self.wall_time_s)
@@ -1,81 +1,319 @@
-from typing import List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 from core.task import Task
 from core.cluster import Cluster
 from core.scheduler import Scheduler
-from core.metrics import MetricsCollector
+from core.metrics import MetricsCollector, StreamingMetricsCollector
+from core.events import EventQueue, ARRIVAL, COMPLETION
+from core.pending_queue import PendingQueue
+from core.instrumentation import Instrumentation
+from core.preemption import Preemptor
+from core.log import logger, enable_verbose_logging, flush_logs
+from core.checkpoint import Checkpointer, load_checkpoint
 
 class Simulator:
-    def __init__(self, cluster: Cluster, scheduler: Scheduler, tasks: List[Task], config: dict):
+    def __init__(self, cluster: Cluster, scheduler: Scheduler, tasks: Iterable[Task], config: dict):
+        """
+        `tasks` is either a list, which is sorted by submit_time up front, or an
+        iterator already in submit_time order (see trace.parser.stream_trace),
+        which is pulled lazily so only in-flight tasks are held in memory.
+        """
         self.cluster = cluster
         self.scheduler = scheduler
-        self.all_tasks = sorted(tasks, key=lambda t: t.submit_time)
-        self.pending_tasks: List[Task] = []
+        if isinstance(tasks, list):
+            tasks = sorted(tasks, key=lambda t: t.submit_time)
+            total_tasks = len(tasks)
+        else:
+            total_tasks = None
+        self.arrivals: Iterator[Task] = iter(tasks)
+        self.last_submit_time = float('-inf')
+        self.arrivals_drained = False
+        self.pending_tasks = PendingQueue()
+        self.arrival_wave: List[Task] = []  # arrived this tick, placed with one batch call
         self.current_time = 0.0
         self.task_index = 0
-        self.metrics = MetricsCollector(len(self.all_tasks), config["algorithm"])
+        self.ticks = 0
+        self.started = False
+        self.events = EventQueue()
+        metrics_cls = StreamingMetricsCollector if config.get("streaming_metrics", False) else MetricsCollector
+        self.metrics = metrics_cls(total_tasks, config["algorithm"], config.get("logs_dir"),
+                                   config.get("utilization_sample_ms"))
+        # With preemption, a task that does not fit may evict lower-priority running tasks
+        self.preemptor = Preemptor(cluster) if config.get("preemption", False) else None
         self.verbose = config["verbose"]
+        self.headless = config.get("headless", False)  # never pause for input, even when verbose
+        if self.verbose:
+            enable_verbose_logging()
+
+        instrumentation_config = config.get("instrumentation") or {}
+        self.instrumentation = None
+        if instrumentation_config.get("enabled", False):
+            self.instrumentation = Instrumentation(
+                chrome_trace_path=instrumentation_config.get("chrome_trace_path"),
+                profile_path=instrumentation_config.get("profile_path")
+            )
+            self._instrument()
+
+        checkpoint_config = config.get("checkpoint") or {}
+        self.checkpointer: Optional[Checkpointer] = None
+        if checkpoint_config.get("directory"):
+            self.checkpointer = Checkpointer(
+                checkpoint_config["directory"],
+                every_ticks=checkpoint_config.get("every_ticks"),
+                every_sim_ms=checkpoint_config.get("every_sim_ms"),
+                keep=checkpoint_config.get("keep", 2)
+            )
+
+    def _instrument(self):
+        """Shadow the phase methods and the strategy's placement methods with timed wrappers."""
+        instrumentation = self.instrumentation
+        self._process_due_events = instrumentation.timed("release", self._process_due_events)
+        self._record_metrics = instrumentation.timed("metrics", self._record_metrics)
+        self._admit_arrivals = instrumentation.timed("arrival", self._admit_arrivals)
+
+        schedule_pending = self._schedule_pending
+        def schedule_pending_with_depth():
+            instrumentation.record_pending_depth(len(self.pending_tasks))
+            schedule_pending()
+        self._schedule_pending = instrumentation.timed("scheduling", schedule_pending_with_depth)
+        self._advance_time = instrumentation.timed("advance", self._advance_time)
+
+        self._instrument_strategy()
+
+    def _instrument_strategy(self):
+        strategy = self.scheduler.strategy
+        strategy.select_node = self.instrumentation.timed_select_node(strategy.select_node)
+        strategy.select_nodes = self.instrumentation.timed_select_nodes(strategy.select_nodes)
 
-    def log(self, string: str):
+    def _uninstrument_strategy(self):
+        """Drop the wrappers from the strategy instance, so it can be reused uninstrumented."""
+        strategy = self.scheduler.strategy
+        strategy.__dict__.pop("select_node", None)
+        strategy.__dict__.pop("select_nodes", None)
+
+    def snapshot_state(self) -> Dict:
+        """
+        Everything needed to continue the run, pickled together so that tasks shared
+        between the event queue, nodes and metrics stay shared. The trace itself is
+        not included: only how many tasks have been pulled from it. The checkpoint
+        schedule and instrumentation counters are carried along, so a resumed run
+        snapshots at the same times and reports totals for the whole run.
+        """
+        return {
+            "current_time": self.current_time,
+            "task_index": self.task_index,
+            "last_submit_time": self.last_submit_time,
+            "ticks": self.ticks,
+            "events": self.events,
+            "pending_tasks": self.pending_tasks,
+            "cluster": self.cluster,
+            "preemptor": self.preemptor,
+            "strategy": self.scheduler.strategy,
+            "metrics": self.metrics,
+            "next_checkpoint_sim_time": self.checkpointer.next_sim_time if self.checkpointer else None,
+            "instrumentation": self.instrumentation.counters() if self.instrumentation else None,
+        }
+
+    def resume(self, path: str):
+        """
+        Restore the state saved in a checkpoint file. The simulator must have been
+        built with the same trace; tasks already pulled before the snapshot are skipped.
+        """
+        state = load_checkpoint(path)
+        self.current_time = state["current_time"]
+        self.last_submit_time = state["last_submit_time"]
+        self.ticks = state["ticks"]
+        self.events = state["events"]
+        self.pending_tasks = state["pending_tasks"]
+        self.cluster = state["cluster"]
+        self.preemptor = state["preemptor"]
+        self.scheduler.strategy = state["strategy"]
+        self.metrics = state["metrics"]
+        if self.checkpointer and state["next_checkpoint_sim_time"] is not None:
+            self.checkpointer.next_sim_time = state["next_checkpoint_sim_time"]
+        if self.instrumentation:
+            if state["instrumentation"] is not None:
+                self.instrumentation.restore_counters(state["instrumentation"])
+            self._instrument_strategy()
+
+        self.task_index = state["task_index"]
+        next(islice(self.arrivals, self.task_index, self.task_index), None)  # skip pulled tasks
+        self.started = True
+
+    def log(self, msg: str, *args):
+        """Log at DEBUG level; arguments are only formatted when verbose."""
         if self.verbose:
-            print(string)
+            logger.debug(msg, *args)
+
+    def _push_next_arrival(self):
+        """Queue the arrival event of the next task in submit order, if any."""
+        task = next(self.arrivals, None)
+        self.arrivals_drained = task is None  # a refillable source may be pulled again later
+        if task is None:
+            return
+        if task.submit_time < self.last_submit_time:
+            raise ValueError(f"Task {task.id} arrives before the previous task; tasks must be in submit_time order")
+        self.last_submit_time = task.submit_time
+        self.events.push(task.submit_time, ARRIVAL, task)
+        self.task_index += 1
 
     def run(self):
-        while (
-            self.task_index < len(self.all_tasks) or                    # if there are still tasks to process
-            self.pending_tasks or                                       # if there are still pending tasks
-            any(n.running_tasks for n in self.cluster.get_all_nodes())  # if there are still running tasks
-        ):
-            self.log('----------------------------------------------------------------')
-            # print(f"Current simulated time: {self.current_time:.0f} ms")
-            self.log("\nCluster state before scheduling:")
-            self.cluster.report(self.verbose); self.log('\n')
-
-            # Release completed tasks
-            self.cluster.release_resources(self.current_time)
-            self.metrics.record_tick(self.cluster, self.current_time)
-
-            # Add newly arrived tasks to pending queue
-            while self.task_index < len(self.all_tasks) and self.all_tasks[self.task_index].submit_time <= self.current_time:
-                self.log(f"New task arrived: {self.all_tasks[self.task_index].id} (CPU={self.all_tasks[self.task_index].cpu}, GPU={self.all_tasks[self.task_index].gpu}, Duration={self.all_tasks[self.task_index].duration} ms)")
-                self.pending_tasks.append(self.all_tasks[self.task_index])
-                self.task_index += 1
-
-            # Attempt to schedule all pending tasks
-            still_pending = []
-            for task in self.pending_tasks:
-                try:
-                    assigned_node = self.scheduler.schedule(task, self.current_time)
-                    self.log(f"✅ Task {task.id} has been assigned to Node {assigned_node}.")
-                    self.metrics.record_task_completion(task)
-                except RuntimeError:
-                    # Task could not be scheduled now; keep it for later
-                    self.log(f"❌ Task {task.id} could not be scheduled now; keeping it for later.")
-                    still_pending.append(task)
-            self.pending_tasks = still_pending
-
-            self.log("\nCluster state after scheduling:")
-            self.cluster.report(self.verbose)
-
-            if(self.verbose): input("\nPress Enter to advance to the next simulated time...\n")
-            self._advance_time()
+        self.start()
+        while self.has_work():
+            self.step()
+        self.finish()
+
+    def start(self):
+        if self.instrumentation:
+            self.instrumentation.start()
+        if not self.started:
+            self.metrics.open()
+            self._push_next_arrival()
+            self.started = True
+
+    def has_work(self) -> bool:
+        return bool(
+            self.events or          # if there are still arrivals or running tasks
+            self.pending_tasks      # if there are still pending tasks
+        )
+
+    def step(self):
+        """Handle everything due at current_time, then advance to the next event."""
+        self.log('----------------------------------------------------------------')
+        # print(f"Current simulated time: {self.current_time:.0f} ms")
+        self.log("\nCluster state before scheduling:")
+        self.cluster.report(self.verbose); self.log('\n')
 
+        arrived = self._process_due_events()
+        self._record_metrics()
+        self._admit_arrivals(arrived)
+        self._schedule_pending()
+
+        self.log("\nCluster state after scheduling:")
+        self.cluster.report(self.verbose)
+
+        if self.verbose and not self.headless:
+            flush_logs()
+            input("\nPress Enter to advance to the next simulated time...\n")
+        self._advance_time()
+        self.ticks += 1
+        if self.checkpointer:
+            self.checkpointer.maybe_checkpoint(self)
+
+    def finish(self):
+        if self.checkpointer:
+            self.checkpointer.close()
         self.log("\nAll tasks processed. Simulation complete\n")
+        flush_logs()
         self.metrics.print_summary()
         self.metrics.save_all_logs()
+        if self.instrumentation:
+            self.instrumentation.stop()
+            self._uninstrument_strategy()
+            self.instrumentation.print_summary()
+            self.instrumentation.save(self.metrics.logs_dir)
 
-    def _advance_time(self):
-        """Advance to the next interesting event (next arrival or completion)."""
-        next_times = []
+    def _process_due_events(self) -> List[Task]:
+        """Release completed tasks and return the ones that have newly arrived."""
+        arrived = []
+        for kind, task in self.events.pop_due(self.current_time):
+            if kind == COMPLETION:
+                if self.preemptor:
+                    self.preemptor.stopped(task)
+                    self.metrics.record_task_completion(task)  # only final once it can no longer be preempted
+                self.cluster.release_task(task, self.current_time)
+                self.pending_tasks.capacity_freed()
+            else:
+                arrived.append(task)
+                self._push_next_arrival()
+        return arrived
+
+    def _record_metrics(self):
+        self.metrics.record_tick(self.cluster, self.current_time)
+
+    def _admit_arrivals(self, arrived: List[Task]):
+        """Collect newly arrived tasks into this tick's arrival wave."""
+        for task in arrived:
+            self.log("New task arrived: %s (CPU=%s, GPU=%s, Duration=%s ms)", task.id, task.cpu, task.gpu, task.duration)
+        self.arrival_wave = arrived
+
+    def _schedule_pending(self):
+        """
+        Attempt to schedule pending tasks whose shape might still fit, then the arrival
+        wave in one batch call. Older tasks go first, as if the wave had been queued behind them.
+        """
+        wave, self.arrival_wave = self.arrival_wave, []
+        pending = self.pending_tasks
+        if self.preemptor or (pending and wave and max(task.priority for task in wave) > pending.min_priority()):
+            # Arrivals may need to go ahead of waiting tasks; queue them and take the general path
+            for task in wave:
+                pending.push(task)
+            wave = []
+        strategy = self.scheduler.strategy
+        pending.place_ready(self._try_schedule, strategy.refusal_blocks_shape)
+        if not wave:
+            return
 
-        if self.task_index < len(self.all_tasks):
-            next_times.append(self.all_tasks[self.task_index].submit_time)
+        wave.sort(key=lambda task: -task.priority)  # stable, so arrival order holds within a priority
+        blocked = [pending.is_blocked(task) for task in wave]
+        batch = [task for task, skip in zip(wave, blocked) if not skip]
+        results = iter(self.scheduler.schedule_batch(batch, self.current_time) if batch else ())
+        for task, skip in zip(wave, blocked):
+            assigned_node = None if skip else next(results)
+            if assigned_node is not None:
+                self._on_placed(task, assigned_node)
+                continue
+            if not skip:
+                self.log("❌ Task %s could not be scheduled now; keeping it for later.", task.id)
+                if strategy.refusal_blocks_shape(task):
+                    pending.block(task)
+            pending.push(task)
 
-        for node in self.cluster.get_all_nodes():
-            for task in node.running_tasks:
-                if task.end_time and task.end_time > self.current_time:
-                    next_times.append(task.end_time)
+    def _try_schedule(self, task: Task) -> bool:
+        assigned_node = self.scheduler.schedule(task, self.current_time)
+        if assigned_node is None and self.preemptor:
+            assigned_node = self._preempt_for(task)
+        if assigned_node is None:
+            # Task could not be scheduled now; it stays pending along with its shape
+            self.log("❌ Task %s could not be scheduled now; keeping it for later.", task.id)
+            return False
+
+        self._on_placed(task, assigned_node)
+        return True
+
+    def _preempt_for(self, task: Task) -> Optional[str]:
+        """Evict the cheapest lower-priority tasks on one node, re-queue them, and assign the task there."""
+        found = self.preemptor.find_victims(task, self.current_time)
+        if found is None:
+            return None
+
+        node, victims = found
+        for victim in victims:
+            self.preemptor.stopped(victim)
+            node.preempt_task(victim, self.current_time)
+            victim.preemptions += 1
+            self.events.mark_stale()  # its completion event is dropped when it surfaces
+            self.metrics.record_preemption(victim)
+            self.pending_tasks.push(victim)
+            self.log("⏏ Task %s preempted on Node %s by Task %s; re-queued with %s ms left.",
+                     victim.id, node.id, task.id, victim.remaining)
+        self.pending_tasks.capacity_freed()
+        node.assign_task(task, self.current_time)
+        return node.id
+
+    def _on_placed(self, task: Task, assigned_node: str):
+        self.events.push(task.end_time, COMPLETION, task)
+        self.log("✅ Task %s has been assigned to Node %s.", task.id, assigned_node)
+        if self.preemptor:
+            self.preemptor.started(task)
+        else:
+            self.metrics.record_task_completion(task)
+
+    def _advance_time(self):
+        """Advance to the next interesting event (next arrival or completion)."""
+        next_time = self.events.next_time_after(self.current_time)
 
-        if next_times:
-            self.current_time = min(next_times)
+        if next_time is not None:
+            self.current_time = next_time
         else:
             self.current_time += 10000.0
\ No newline at end of file
@@ -1,17 +1,26 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)  # no per-instance __dict__; traces hold millions of these
 class Task:
     id: str                       # Unique task ID
     submit_time: float            # When the task is submitted (in seconds or ms since epoch/zero)
     cpu: float                    # CPU units requested
     gpu: int                      # Number of GPUs requested
     duration: float               # Duration the task will run (in seconds)
+    priority: int = 0             # Priority class; with preemption, higher classes may evict lower ones
 
     start_time: Optional[float] = None  # When the task actually starts
     end_time: Optional[float] = None    # When it ends
     assigned_node: Optional[str] = None # Node ID (if scheduled)
+    preemptions: int = 0                # Times the task was evicted and re-queued
+    remaining: Optional[float] = None   # Work left after its last preemption, if any
+    first_start_time: Optional[float] = None  # When it first started; start_time is the latest (re)start
+
+    @property
+    def work_left(self) -> float:
+        """How long the task runs once (re)started: its duration, or what a preemption left of it."""
+        return self.duration if self.remaining is None else self.remaining
 
     def is_running(self, current_time: float) -> bool:
         """Check if task is currently running at the given simulation time."""
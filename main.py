@@ -1,20 +1,33 @@
 from core.cluster import Cluster
 from core.scheduler import Scheduler
 from core.simulator import Simulator
+from core.checkpoint import latest_checkpoint
 from core.task import Task
 import yaml
 from algorithms.best_fit import BestFitScheduler
 from algorithms.round_robin import RoundRobinScheduler
 from algorithms.bin_packing import BinPackingScheduler
-from trace.parser import load_trace
-import matplotlib.pyplot as plt
+from algorithms.backfill import BackfillScheduler
+from trace.parser import load_trace, stream_trace
 from typing import List
-import os
+import argparse
+import logging
+import sys
 
 def load_config(path: str) -> dict:
     with open(path, "r") as f:
         return yaml.safe_load(f)
 
+def get_cluster(cluster_config: dict) -> Cluster:
+    backend = cluster_config.get("backend", "python").lower()
+    if backend == "python":
+        return Cluster(cluster_config)
+    elif backend == "numpy":
+        from core.array_cluster import ArrayCluster  # NumPy is only needed for this backend
+        return ArrayCluster(cluster_config)
+    else:
+        raise ValueError(f"Unknown cluster backend: {backend}")
+
 def get_algorithm(name: str, cluster):
     name = name.lower()
     if name == "best_fit":
@@ -23,10 +36,13 @@ def get_algorithm(name: str, cluster):
         return RoundRobinScheduler(cluster)
     elif name == "bin_packing":
         return BinPackingScheduler(cluster)
+    elif name == "backfill":
+        return BackfillScheduler(cluster)
     else:
         raise ValueError(f"Unknown algorithm: {name}")
 
 def plots(tasks: List[Task]):
+    import matplotlib.pyplot as plt  # only needed when plotting
     durations = [t.duration for t in tasks]
     plt.hist(durations, bins=30)
     plt.title("Task Duration Distribution")
@@ -41,23 +57,61 @@ def plots(tasks: List[Task]):
     plt.ylabel("Count of Requests")
     plt.show()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay a trace through a scheduling algorithm.")
+    parser.add_argument("--config", default="config.yaml", help="path to the simulation config")
+    parser.add_argument("--headless", action="store_true",
+                        help="never wait for input and never open plot windows (for unattended batch runs)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from the newest snapshot in the configured checkpoint directory")
+    parser.add_argument("--plot", action="store_true",
+                        help="save utilization plots to <logs_dir>/plots after the run (no longer done by default)")
+    parser.add_argument("--log-stdout", action="store_true",
+                        help="write progress lines to stdout, as before, instead of stderr")
+    return parser.parse_args()
+
 def main():
-    config = load_config("config.yaml")
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout if args.log_stdout else None)
+    config = load_config(args.config)
+    config["headless"] = args.headless
     print(config)
 
-    cluster = Cluster(config["cluster"])
+    if config.get("stream_trace", False):
+        tasks = stream_trace(config["trace_file"], presorted=config.get("trace_sorted", False))
+    else:
+        tasks = load_trace(config["trace_file"])
+    # plots(tasks)
+
+    if (config.get("sharding") or {}).get("shards", 1) > 1:
+        if args.resume or args.plot:
+            raise SystemExit("--resume and --plot are not supported for sharded runs")
+        from core.sharding import ShardedSimulator
+        if not args.headless:
+            input("Press any key to begin the simulation")
+        ShardedSimulator(config["cluster"], tasks, config).run()
+        return
+
+    cluster = get_cluster(config["cluster"])
 
     algorithm = get_algorithm(config["algorithm"], cluster)
     scheduler = Scheduler(strategy=algorithm)
-
-    tasks = load_trace(config["trace_file"])
-    # plots(tasks)
     
-    input("Press any key to begin the simulation")
+    if not args.headless:
+        input("Press any key to begin the simulation")
     sim = Simulator(cluster, scheduler, tasks, config)
+    if args.resume:
+        checkpoint_dir = (config.get("checkpoint") or {}).get("directory")
+        path = latest_checkpoint(checkpoint_dir) if checkpoint_dir else None
+        if path is None:
+            raise SystemExit("No checkpoint to resume from; set checkpoint.directory in the config")
+        print(f"Resuming from {path}")
+        sim.resume(path)
     sim.run()
 
-    os.system("python3 logs/plot_logs.py")
+    if args.plot:
+        from core.plotting import plot_utilization
+        plot_utilization(sim.metrics, show=not args.headless)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
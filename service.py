@@ -0,0 +1,366 @@
+"""
+Live placement service: runs the configured Scheduler strategy behind a local
+asyncio TCP server speaking newline-delimited JSON, one request per line.
+
+    {"op": "place", "id": "t1", "cpu": 4, "gpu": 1, "duration": 60000, "priority": 0}
+        -> {"op": "place", "id": "t1", "node": "n-3"}      (node is null when nothing fits now)
+    {"op": "place_gang", "id": "job1", "tasks": [{"id": "job1-0", "cpu": 8, "gpu": 2}, ...]}
+        -> {"op": "place_gang", "id": "job1", "nodes": ["n-3", "n-7"]}   (all or nothing)
+    {"op": "complete", "id": "t1"}
+        -> {"op": "complete", "id": "t1", "ok": true}
+    {"op": "stats"}
+        -> requests/s, p50/p99 decision latency, batch sizes, utilization
+
+Placement and completion requests arriving within batch_window_ms of each other
+are decided together, with consecutive placements going through one
+schedule_batch call. A connection may pipeline requests; responses come back in
+request order.
+
+    python service.py serve [--config config.yaml] [--port 8765]
+    python service.py from-trace alibaba_trace.csv service_requests.jsonl
+    python service.py replay service_requests.jsonl [--connections 8]
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import time
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from core.scheduler import Scheduler
+from core.sketch import QuantileSketch
+from core.task import Task
+from trace.parser import load_trace
+from main import load_config, get_algorithm, get_cluster
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class PlacementService:
+    def __init__(self, scheduler: Scheduler, batch_window_ms: float=2.0, max_batch: int=256):
+        self.scheduler = scheduler
+        self.cluster = scheduler.strategy.cluster
+        self.batch_window_s = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.running: Dict[str, Task] = {}
+
+        self.requests = 0
+        self.batches = 0
+        self.decision_latency = QuantileSketch()  # seconds from receipt to decision
+        self.first_request: Optional[float] = None
+        self.started = time.monotonic()
+        self._queue: Optional[asyncio.Queue] = None
+
+    def now_ms(self) -> float:
+        """Service clock handed to the scheduler as simulated time."""
+        return (time.monotonic() - self.started) * 1000
+
+    async def serve(self, host: str, port: int):
+        self._queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        logger.info("Placement service listening on %s:%d", host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        responses: asyncio.Queue = asyncio.Queue()
+
+        async def write_responses():
+            while True:
+                response = await responses.get()
+                if response is None:
+                    return
+                writer.write((json.dumps(await response) + "\n").encode())
+                await writer.drain()
+
+        writer_task = asyncio.create_task(write_responses())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    responses.put_nowait(self._submit(line))
+        finally:
+            responses.put_nowait(None)
+            await writer_task
+            writer.close()
+
+    def _submit(self, line: bytes) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            request = json.loads(line)
+            op = request["op"]
+        except (ValueError, KeyError, TypeError) as e:
+            future.set_result({"error": f"bad request: {e}"})
+            return future
+
+        if op == "stats":
+            future.set_result(self.stats())
+        elif op in ("place", "place_gang", "complete"):
+            received = time.perf_counter()
+            if self.first_request is None:
+                self.first_request = received
+            self._queue.put_nowait((received, request, future))
+        else:
+            future.set_result({"error": f"unknown op: {op}"})
+        return future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window_s
+            while len(batch) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+            self._decide(batch)
+
+    def _decide(self, batch: List[Tuple[float, Dict, asyncio.Future]]):
+        """Apply a micro-batch in arrival order, placing consecutive 'place' requests together."""
+        self.batches += 1
+        now = self.now_ms()
+        i = 0
+        while i < len(batch):
+            request = batch[i][1]
+            if request["op"] != "place":
+                try:
+                    response = self._apply(request, now)
+                except Exception as e:  # one bad request must not take the batcher down
+                    logger.exception("Failed to apply %s request", request["op"])
+                    response = {"op": request["op"], "id": request.get("id"), "error": str(e)}
+                self._resolve(batch[i], response)
+                i += 1
+                continue
+
+            j = i
+            while j < len(batch) and batch[j][1]["op"] == "place":
+                j += 1
+            self._place(batch[i:j], now)
+            i = j
+
+    def _place(self, group: List[Tuple[float, Dict, asyncio.Future]], now: float):
+        tasks, checked = [], []
+        batch_ids = set()
+        for item in group:
+            task, error = self._task(item[1], now, batch_ids)
+            if error:
+                self._resolve(item, {"op": "place", "id": item[1].get("id"), "error": error})
+            else:
+                tasks.append(task)
+                checked.append(item)
+                batch_ids.add(task.id)
+        try:
+            node_ids = self.scheduler.schedule_batch(tasks, now) if tasks else []
+        except Exception as e:
+            logger.exception("Failed to place a batch of %d tasks", len(tasks))
+            for item, task in zip(checked, tasks):
+                if task.assigned_node is not None:
+                    self.cluster.get_node_by_id(task.assigned_node).unassign_task(task)
+                self._resolve(item, {"op": "place", "id": task.id, "error": str(e)})
+            return
+        for item, task, node_id in zip(checked, tasks, node_ids):
+            if node_id is not None:
+                self.running[task.id] = task
+            self._resolve(item, {"op": "place", "id": task.id, "node": node_id})
+
+    def _task(self, request: Dict, now: float, batch_ids: Set[str]) -> Tuple[Optional[Task], Optional[str]]:
+        """Build a task from a request, or explain why it is rejected. IDs in batch_ids are taken."""
+        try:
+            cpu = float(request["cpu"])
+            gpu = float(request.get("gpu", 0))
+            duration = float(request.get("duration", float('inf')))  # unknown unless given
+            if not cpu >= 0 or not gpu >= 0 or not duration >= 0:
+                return None, "cpu, gpu and duration must not be negative"
+            if not gpu.is_integer():
+                return None, f"gpu must be a whole number, got {request['gpu']}"
+            task = Task(
+                id=str(request["id"]),
+                submit_time=now,
+                cpu=cpu,
+                gpu=int(gpu),
+                duration=duration,
+                priority=int(request.get("priority", 0))
+            )
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            return None, f"bad task: {e!r}"
+        if task.id in self.running or task.id in batch_ids:
+            return None, f"task {task.id} is already running"
+        return task, None
+
+    def _apply(self, request: Dict, now: float) -> Dict:
+        if request["op"] == "complete":
+            task = self.running.pop(str(request.get("id")), None)
+            if task is not None:
+                self.cluster.release_task(task, now)
+            return {"op": "complete", "id": request.get("id"), "ok": task is not None}
+
+        # place_gang
+        members = request.get("tasks")
+        if not isinstance(members, list) or not members:
+            return {"op": "place_gang", "id": request.get("id"), "error": "tasks must be a non-empty list"}
+        tasks = []
+        gang_ids = set()
+        for member in members:
+            task, error = self._task(member, now, gang_ids)
+            if error:
+                return {"op": "place_gang", "id": request.get("id"), "error": error}
+            tasks.append(task)
+            gang_ids.add(task.id)
+        node_ids = self.scheduler.schedule_gang(tasks, now)
+        if node_ids is not None:
+            self.running.update((task.id, task) for task in tasks)
+        return {"op": "place_gang", "id": request.get("id"), "nodes": node_ids}
+
+    def _resolve(self, item: Tuple[float, Dict, asyncio.Future], response: Dict):
+        received, _, future = item
+        self.decision_latency.add(time.perf_counter() - received)
+        self.requests += 1
+        future.set_result(response)
+
+    def stats(self) -> Dict:
+        elapsed = time.perf_counter() - self.first_request if self.first_request is not None else 0.0
+        cpu_util, gpu_util = self.cluster.utilization()
+        return {
+            "op": "stats",
+            "requests": self.requests,
+            "requests_per_s": self.requests / elapsed if elapsed > 0 else 0.0,
+            "p50_decision_latency_ms": self.decision_latency.quantile(0.5) * 1000,
+            "p99_decision_latency_ms": self.decision_latency.quantile(0.99) * 1000,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "running_tasks": len(self.running),
+            "cpu_utilization": cpu_util,
+            "gpu_utilization": gpu_util,
+        }
+
+def trace_to_requests(trace_path: str, out_path: str):
+    """
+    Write a replayable request stream for a trace: a placement at each submit_time
+    and a completion at submit_time + duration, in time order.
+    """
+    tasks = sorted(load_trace(trace_path), key=lambda t: t.submit_time)
+    completions: List[Tuple[float, int, str]] = []
+    with open(out_path, "w") as f:
+        for seq, task in enumerate(tasks):
+            while completions and completions[0][0] <= task.submit_time:
+                f.write(json.dumps({"op": "complete", "id": heapq.heappop(completions)[2]}) + "\n")
+            f.write(json.dumps({"op": "place", "id": task.id, "cpu": task.cpu, "gpu": task.gpu,
+                                "duration": task.duration, "priority": task.priority}) + "\n")
+            heapq.heappush(completions, (task.submit_time + task.duration, seq, task.id))
+        while completions:
+            f.write(json.dumps({"op": "complete", "id": heapq.heappop(completions)[2]}) + "\n")
+
+async def replay(path: str, host: str, port: int, connections: int):
+    """
+    Load-test a running service with a JSONL request stream. Requests are spread
+    over pipelined connections by task ID, so each task's placement and completion
+    keep their order.
+    """
+    with open(path) as f:
+        requests = [line.strip() for line in f if line.strip()]
+    streams: List[List[str]] = [[] for _ in range(connections)]
+    for line in requests:
+        streams[zlib.crc32(str(json.loads(line).get("id")).encode()) % connections].append(line)
+
+    latency = QuantileSketch()
+
+    async def run_stream(lines: List[str]):
+        if not lines:
+            return
+        reader, writer = await asyncio.open_connection(host, port)
+        sent: asyncio.Queue = asyncio.Queue()
+
+        async def send():
+            for line in lines:
+                sent.put_nowait(time.perf_counter())
+                writer.write((line + "\n").encode())
+                await writer.drain()
+
+        sender = asyncio.create_task(send())
+        for _ in lines:
+            await reader.readline()
+            latency.add(time.perf_counter() - await sent.get())
+        await sender
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_stream(lines) for lines in streams))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    server_stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+
+    print(f"Replayed {len(requests)} requests over {connections} connections in {elapsed:.2f}s "
+          f"({len(requests) / elapsed:.0f} requests/s)")
+    print(f"  client round-trip p50 {latency.quantile(0.5) * 1000:.2f} ms, p99 {latency.quantile(0.99) * 1000:.2f} ms")
+    print("Service stats:")
+    for key, value in server_stats.items():
+        if key != "op":
+            print(f"  - {key}: {value:.2f}" if isinstance(value, float) else f"  - {key}: {value}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the placement service")
+    serve.add_argument("--config", default="config.yaml", help="cluster, algorithm and service settings")
+    serve.add_argument("--host")
+    serve.add_argument("--port", type=int)
+
+    from_trace = commands.add_parser("from-trace", help="turn a trace into a replayable request stream")
+    from_trace.add_argument("trace")
+    from_trace.add_argument("output")
+
+    replay_parser = commands.add_parser("replay", help="load-test a running service from a JSONL file")
+    replay_parser.add_argument("requests")
+    replay_parser.add_argument("--host", default=DEFAULT_HOST)
+    replay_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    replay_parser.add_argument("--connections", type=int, default=8)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "from-trace":
+        trace_to_requests(args.trace, args.output)
+        print(f"Wrote {args.output}")
+    elif args.command == "replay":
+        asyncio.run(replay(args.requests, args.host, args.port, args.connections))
+    else:
+        config = load_config(args.config)
+        service_config = config.get("service") or {}
+        cluster = get_cluster(config["cluster"])
+        scheduler = Scheduler(strategy=get_algorithm(config["algorithm"], cluster))
+        service = PlacementService(scheduler, batch_window_ms=service_config.get("batch_window_ms", 2.0),
+                                   max_batch=service_config.get("max_batch", 256))
+        host = args.host or service_config.get("host", DEFAULT_HOST)
+        port = args.port or service_config.get("port", DEFAULT_PORT)
+        try:
+            asyncio.run(service.serve(host, port))
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Parameter sweep runner: simulates every algorithm x cluster config x trace
+combination from a sweep file in a process pool and writes one results table.
+
+    python sweep.py [sweep.yaml]
+"""
+import csv
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import product
+from typing import Dict, List
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from core.task import Task
+from trace.parser import load_trace
+from main import load_config, get_algorithm, get_cluster
+
+# Parsed traces, keyed by path. Filled in the parent before the pool starts so
+# forked workers inherit them; spawned workers load them once in _init_worker.
+_TRACES: Dict[str, List[Task]] = {}
+
+def _init_worker(trace_paths: List[str]):
+    for path in trace_paths:
+        if path not in _TRACES:
+            _TRACES[path] = load_trace(path)
+
+SHAPE_KEYS = ("name", "pools", "num_nodes", "node_cpu", "node_gpu")
+
+def cluster_label(cluster_config: Dict) -> str:
+    """Name a cluster config by its name or node shape, plus any other settings such as the backend."""
+    if "name" in cluster_config:
+        label = cluster_config["name"]
+    elif cluster_config.get("pools"):
+        label = "+".join(f"{pool['count']}x{pool['node_cpu']}c{pool['node_gpu']}g" for pool in cluster_config["pools"])
+    else:
+        label = f"n{cluster_config['num_nodes']}-cpu{cluster_config['node_cpu']}-gpu{cluster_config['node_gpu']}"
+    for key, value in sorted(cluster_config.items()):
+        if key not in SHAPE_KEYS and value is not None:
+            label += f"-{key}={value}"
+    return label
+
+def build_runs(sweep: Dict) -> List[Dict]:
+    # Clusters that still share a label are numbered, so no two runs write to the same logs_dir
+    labels = [cluster_label(cluster_config) for cluster_config in sweep["clusters"]]
+    labels = [label if labels.count(label) == 1 else f"{label}-{labels[:i].count(label) + 1}"
+              for i, label in enumerate(labels)]
+    runs = []
+    for trace_path, (cluster_config, label), algorithm in product(sweep["traces"], zip(sweep["clusters"], labels),
+                                                                  sweep["algorithms"]):
+        trace_name = os.path.splitext(os.path.basename(trace_path))[0]
+        runs.append({
+            "trace": trace_path,
+            "cluster": cluster_config,
+            "algorithm": algorithm,
+            "label": label,
+            "logs_dir": os.path.join(sweep.get("output_dir", "logs/sweep"), trace_name, label, algorithm),
+        })
+    return runs
+
+def run_one(run: Dict) -> Dict:
+    """Simulate a single sweep point and return its row of the results table."""
+    cluster = get_cluster(run["cluster"])
+    scheduler = Scheduler(strategy=get_algorithm(run["algorithm"], cluster))
+    # Simulations mutate tasks, so every run gets fresh copies of the shared trace
+    tasks = [Task(t.id, t.submit_time, t.cpu, t.gpu, t.duration, t.priority) for t in _TRACES[run["trace"]]]
+    config = {"algorithm": run["algorithm"], "verbose": False, "logs_dir": run["logs_dir"]}
+
+    sim = Simulator(cluster, scheduler, tasks, config)
+    with redirect_stdout(io.StringIO()):  # keep per-run progress output from interleaving
+        sim.run()
+
+    row = {"trace": run["trace"], "cluster": run["label"], "algorithm": run["algorithm"], "logs_dir": run["logs_dir"]}
+    row.update(sim.metrics.summary())
+    return row
+
+def run_sweep(sweep: Dict) -> List[Dict]:
+    runs = build_runs(sweep)
+    trace_paths = sorted(set(sweep["traces"]))
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _init_worker(trace_paths)
+    else:
+        context = multiprocessing.get_context()
+
+    workers = sweep.get("workers") or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(trace_paths,)) as pool:
+        rows = []
+        for row in pool.map(run_one, runs):
+            print(f"Finished {row['algorithm']} on {row['cluster']} ({row['trace']})")
+            rows.append(row)
+    return rows
+
+def save_results(rows: List[Dict], path: str):
+    fieldnames = []
+    for row in rows:
+        fieldnames.extend(k for k in row if k not in fieldnames)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    sweep = load_config(sys.argv[1] if len(sys.argv) > 1 else "sweep.yaml")
+    rows = run_sweep(sweep)
+    results_path = os.path.join(sweep.get("output_dir", "logs/sweep"), "results.csv")
+    save_results(rows, results_path)
+    print(f"Wrote {len(rows)} results to {results_path}")
+
+if __name__ == "__main__":
+    main()
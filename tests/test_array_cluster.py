@@ -0,0 +1,32 @@
+import random
+import pytest
+from core.task import Task
+from main import get_algorithm, get_cluster
+
+pytest.importorskip("numpy")
+
+CLUSTER = {"pools": [{"name": "cpu", "count": 5, "node_cpu": 48, "node_gpu": 0},
+                     {"name": "gpu", "count": 7, "node_cpu": 96, "node_gpu": 2}]}
+
+@pytest.mark.parametrize("algorithm", ["best_fit", "round_robin", "bin_packing"])
+def test_numpy_backend_makes_the_python_backend_choices(algorithm):
+    rng = random.Random(11)
+    clusters = [get_cluster(dict(CLUSTER, backend=backend)) for backend in ("python", "numpy")]
+    schedulers = [get_algorithm(algorithm, cluster) for cluster in clusters]
+    running = []
+    for i in range(2000):
+        if running and rng.random() < 0.45:
+            done = running.pop(rng.randrange(len(running)))
+            for cluster, task in zip(clusters, done):
+                cluster.release_task(task, float(i))
+            continue
+        shape = dict(cpu=rng.choice([0.5, 4, 16, 48.5, 96]), gpu=rng.choice([0, 0, 1, 2]))
+        tasks = [Task(id=f"t{i}", submit_time=0.0, duration=1.0, **shape) for _ in clusters]
+        python_cluster, numpy_cluster = clusters
+        assert list(numpy_cluster.fit_mask(tasks[1])) == [node.can_fit(tasks[0]) for node in python_cluster.nodes]
+        node_ids = [scheduler.select_node(task) for scheduler, task in zip(schedulers, tasks)]
+        assert node_ids[0] == node_ids[1]
+        if node_ids[0] is not None:
+            for cluster, task in zip(clusters, tasks):
+                cluster.get_node_by_id(node_ids[0]).assign_task(task, float(i))
+            running.append(tasks)
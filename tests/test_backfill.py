@@ -0,0 +1,53 @@
+from algorithms.backfill import BackfillScheduler
+from core.availability import AvailabilityProfile
+from core.cluster import Cluster
+from core.node import Node
+from core.scheduler import Scheduler
+from core.task import Task
+
+def make_task(id, cpu, gpu=0, duration=100.0):
+    return Task(id=id, submit_time=0.0, cpu=cpu, gpu=gpu, duration=duration)
+
+def test_availability_profile_steps_at_end_times():
+    node = Node("n-0", cpu_capacity=8, gpu_capacity=2)
+    node.assign_task(make_task("a", 2, 0, duration=10), 0.0)
+    node.assign_task(make_task("b", 4, 1, duration=20), 0.0)
+    profile = AvailabilityProfile(node)
+    assert profile.earliest_fit(2, 1, now=0.0) == 0.0
+    assert profile.earliest_fit(4, 1, now=0.0) == 10
+    assert profile.earliest_fit(6, 2, now=0.0) == 20
+    assert profile.earliest_fit(9, 0, now=0.0) == float('inf')
+    assert profile.free_at(5) == (2, 1)
+    assert profile.free_at(10) == (4, 1)
+    assert profile.free_at(20) == (8, 2)
+
+def make_backfill():
+    cluster = Cluster({"num_nodes": 1, "node_cpu": 4, "node_gpu": 0})
+    strategy = BackfillScheduler(cluster)
+    scheduler = Scheduler(strategy)
+    assert scheduler.schedule(make_task("running", 2, duration=100), 0.0) == "n-0"
+    return scheduler, strategy
+
+def test_head_gets_a_reservation_and_only_short_tasks_backfill():
+    scheduler, strategy = make_backfill()
+    head = make_task("head", 4)
+    assert scheduler.schedule(head, 10.0) is None
+    assert strategy.reservation.task is head and strategy.reservation.start_time == 100
+
+    long_task = make_task("long", 2, duration=500)
+    assert scheduler.schedule(long_task, 10.0) is None
+    assert scheduler.schedule(make_task("short", 2, duration=50), 10.0) == "n-0"
+
+def test_only_refusals_protecting_the_reservation_spare_the_shape():
+    scheduler, strategy = make_backfill()
+    head = make_task("head", 4)
+    assert scheduler.schedule(head, 10.0) is None
+    assert strategy.refusal_blocks_shape(head)  # nothing can host it now
+
+    long_task = make_task("long", 2, duration=500)
+    assert scheduler.schedule(long_task, 10.0) is None
+    assert not strategy.refusal_blocks_shape(long_task)  # a shorter task of this shape still fits
+
+    too_big = make_task("too_big", 3)
+    assert scheduler.schedule(too_big, 10.0) is None
+    assert strategy.refusal_blocks_shape(too_big)
@@ -0,0 +1,26 @@
+import json
+import pytest
+from benchmarks.run import ALGORITHMS, compare, run_case
+from trace.synthetic import generate_trace
+
+def test_synthetic_traces_are_reproducible():
+    first = list(generate_trace(200, total_cpu=4 * 192, seed=3, max_cpu=192, max_gpu=2))
+    second = list(generate_trace(200, total_cpu=4 * 192, seed=3, max_cpu=192, max_gpu=2))
+    assert first == second
+    assert [t.submit_time for t in first] == sorted(t.submit_time for t in first)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_run_case_places_every_task(algorithm):
+    case = {"size": "tiny", "algorithm": algorithm, "backend": "python", "seed": 0, "num_tasks": 300, "num_nodes": 4}
+    result = run_case(case)
+    assert result["placements"] == 300
+    assert result["events"] == 600
+    assert result["placement_attempts"] >= 300
+    assert result["events_per_s"] > 0
+
+def test_compare_reports_the_speedup(tmp_path, capsys):
+    result = {"size": "tiny", "algorithm": "best_fit", "backend": "python", "seed": 0, "events_per_s": 300.0}
+    with open(tmp_path / "old.json", "w") as f:
+        json.dump({"results": [dict(result, events_per_s=100.0)]}, f)
+    compare([result], str(tmp_path / "old.json"))
+    assert "3.00x" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+import os
+import pytest
+from core.checkpoint import load_checkpoint
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from main import get_algorithm, get_cluster
+from trace.synthetic import generate_trace
+
+def make_simulator(tmp_path, name, algorithm="round_robin", preemption=False):
+    cluster = get_cluster({"num_nodes": 6, "node_cpu": 192, "node_gpu": 2})
+    tasks = list(generate_trace(600, total_cpu=6 * 192, seed=7, load=1.1, max_cpu=192, max_gpu=2))
+    if preemption:
+        for i, task in enumerate(tasks):
+            task.priority = i % 3
+    config = {
+        "algorithm": algorithm, "verbose": False, "logs_dir": str(tmp_path / name / "logs"), "preemption": preemption,
+        "checkpoint": {"directory": str(tmp_path / name / "ckpt"), "every_sim_ms": 200_000, "keep": 1000},
+        "instrumentation": {"enabled": True},
+    }
+    return Simulator(cluster, Scheduler(get_algorithm(algorithm, cluster)), tasks, config)
+
+def counts(instrumentation):
+    counters = instrumentation.counters()
+    del counters["phase_time_ns"], counters["select_node_time_ns"]
+    return counters
+
+@pytest.mark.parametrize("preemption", [False, True])
+def test_resume_reproduces_the_full_run(tmp_path, preemption):
+    full = make_simulator(tmp_path, "full", preemption=preemption)
+    full.run()
+    with open(os.path.join(full.metrics.logs_dir, "task_log.csv")) as f:
+        full_log = f.read()
+    snapshots = sorted(os.listdir(tmp_path / "full" / "ckpt"))
+    assert len(snapshots) > 4
+    middle = snapshots[len(snapshots) // 2]
+
+    resumed = make_simulator(tmp_path, "resumed", preemption=preemption)
+    resumed.resume(str(tmp_path / "full" / "ckpt" / middle))
+    resumed.run()
+
+    with open(os.path.join(resumed.metrics.logs_dir, "task_log.csv")) as f:
+        assert f.read() == full_log
+    # Snapshots continue on the same schedule and counters cover the whole run
+    assert sorted(os.listdir(tmp_path / "resumed" / "ckpt")) == [name for name in snapshots if name > middle]
+    assert counts(resumed.instrumentation) == counts(full.instrumentation)
+    if preemption:
+        assert resumed.metrics.preemptions == full.metrics.preemptions > 0
+
+def test_snapshot_carries_the_checkpoint_schedule(tmp_path):
+    simulator = make_simulator(tmp_path, "run")
+    simulator.run()
+    path = sorted((tmp_path / "run" / "ckpt").iterdir())[-1]
+    state = load_checkpoint(str(path))
+    assert state["next_checkpoint_sim_time"] % 200_000 == 0
+    assert state["instrumentation"]["placement_attempts"] > 0
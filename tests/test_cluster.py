@@ -0,0 +1,74 @@
+import math
+import random
+from core.cluster import Cluster
+from core.metrics import MetricsCollector
+from core.task import Task
+
+def test_utilization_stays_exact_with_fractional_cpu():
+    rng = random.Random(10)
+    cluster = Cluster({"pools": [{"name": "small", "count": 5, "node_cpu": 7.3, "node_gpu": 1},
+                                 {"name": "big", "count": 5, "node_cpu": 96.1, "node_gpu": 4}]})
+    running = []
+    for i in range(5000):
+        if running and rng.random() < 0.45:
+            task = running.pop(rng.randrange(len(running)))
+            cluster.release_task(task, float(i))
+        else:
+            task = Task(id=f"t{i}", submit_time=0.0, cpu=round(rng.uniform(0.1, 3.0), 3), gpu=rng.randint(0, 1), duration=1.0)
+            node = rng.choice(cluster.nodes)
+            if not node.can_fit(task):
+                continue
+            node.assign_task(task, float(i))
+            running.append(task)
+
+        used = math.fsum(node.cpu_capacity - node.cpu_available for node in cluster.nodes if node.running_tasks)
+        assert cluster.utilization()[0] == used / cluster.total_cpu
+
+    for task in running:
+        cluster.release_task(task, 5000.0)
+    assert cluster.utilization() == (0.0, 0.0)
+    assert all(util == (0.0, 0.0) for util in cluster.group_utilization().values())
+
+def test_utilization_is_sampled_at_most_once_per_interval(tmp_path):
+    cluster = Cluster({"num_nodes": 1, "node_cpu": 8, "node_gpu": 0})
+    metrics = MetricsCollector(None, "test", str(tmp_path), sample_interval=100.0)
+    for time in (0.0, 10.0, 99.0, 100.0, 150.0, 420.0, 430.0):
+        metrics.record_tick(cluster, time)
+    assert metrics.time_ticks == [0.0, 100.0, 420.0]
+
+POOLS = {"pools": [{"name": "cpu", "count": 4, "node_cpu": 32, "node_gpu": 0},
+                   {"name": "gpu", "count": 3, "node_cpu": 64, "node_gpu": 8},
+                   {"name": "big", "count": 2, "node_cpu": 128, "node_gpu": 0},
+                   {"name": "empty", "count": 0, "node_cpu": 256, "node_gpu": 8}]}
+
+def test_fitting_ranges_cover_exactly_the_nodes_big_enough():
+    cluster = Cluster(POOLS)
+    assert [node.id for node in cluster.nodes] == [f"n-{i}" for i in range(9)]
+    assert cluster.capacity_classes() == [(32, 0), (128, 0), (64, 8)]
+    for cpu in (1, 32, 33, 64, 65, 128, 129):
+        for gpu in (0, 1, 8, 9):
+            task = Task(id="t", submit_time=0.0, cpu=cpu, gpu=gpu, duration=1.0)
+            covered = [p for lo, hi in cluster.fitting_ranges(task) for p in range(lo, hi)]
+            expected = [p for p, node in enumerate(cluster.nodes)
+                        if node.cpu_capacity >= cpu and node.gpu_capacity >= gpu]
+            assert covered == expected
+
+def test_round_robin_over_pools_matches_a_full_lap():
+    from algorithms.round_robin import RoundRobinScheduler
+    rng = random.Random(4)
+    cluster = Cluster(POOLS)
+    scheduler = RoundRobinScheduler(cluster)
+    running = []
+    for i in range(3000):
+        if running and rng.random() < 0.4:
+            cluster.release_task(running.pop(rng.randrange(len(running))), float(i))
+            continue
+        task = Task(id=f"t{i}", submit_time=0.0, cpu=rng.choice([4, 16, 40, 100]), gpu=rng.choice([0, 0, 2]), duration=1.0)
+        start = scheduler.current_index
+        lap = [cluster.nodes[(start + k) % len(cluster.nodes)] for k in range(len(cluster.nodes))]
+        expected = next((node.id for node in lap if node.can_fit(task)), None)
+        node_id = scheduler.select_node(task)
+        assert node_id == expected
+        if node_id is not None:
+            cluster.get_node_by_id(node_id).assign_task(task, float(i))
+            running.append(task)
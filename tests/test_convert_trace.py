@@ -0,0 +1,66 @@
+import csv
+import pytest
+from convert_trace import ConversionReport, TraceFilter, convert, read_raw_trace
+
+HEADER = "instance_sn,cpu_request,gpu_request,creation_time,scheduled_time,deletion_time\n"
+
+def write_raw(path, rows):
+    with open(path, "w") as f:
+        f.write(HEADER)
+        f.writelines(rows)
+
+def raw_rows(n):
+    rows = []
+    for i in range(n):
+        scheduled = (i * 37) % 1000
+        if i % 10 == 0:
+            rows.append(f"i{i},4,1,{scheduled},,\n")  # never finished
+        elif i % 17 == 0:
+            rows.append(f"i{i},4,x,{scheduled},{scheduled},{scheduled + 5}\n")  # malformed
+        else:
+            rows.append(f"i{i},{i % 8 + 1},{i % 3},{scheduled},{scheduled},{scheduled + i * 100}\n")
+    return rows
+
+def test_chunked_parallel_conversion_matches_one_chunk(tmp_path):
+    write_raw(tmp_path / "raw.csv", raw_rows(2000))
+    one = list(read_raw_trace(str(tmp_path / "raw.csv"), workers=1))
+    report = ConversionReport(0, 0, {})
+    chunked = list(read_raw_trace(str(tmp_path / "raw.csv"), workers=3, chunk_bytes=997, report=report))
+    assert chunked == one
+    assert [row[1] for row in one] == sorted(row[1] for row in one)
+    assert report.rows == 2000
+    assert report.kept + sum(report.dropped.values()) == 2000
+    assert report.dropped["incomplete"] == 200
+
+def test_filters_drop_rows_per_reason(tmp_path):
+    write_raw(tmp_path / "raw.csv", raw_rows(2000))
+    filters = TraceFilter(min_duration=1000, max_duration=100_000, gpu_only=True, start=100, end=900, sample=0.5)
+    report = ConversionReport(0, 0, {})
+    rows = list(read_raw_trace(str(tmp_path / "raw.csv"), filters, workers=1, chunk_bytes=1500, report=report))
+    assert rows and all(1000 <= duration <= 100_000 and gpu > 0 and 100 <= submit < 900
+                        for _, submit, _, gpu, duration in rows)
+    assert set(report.dropped) >= {"incomplete", "malformed", "duration", "no_gpu", "time_window", "sampled_out"}
+    assert len(rows) == report.kept
+    # Sampling is by id, so it does not depend on how the file was chunked
+    assert rows == list(read_raw_trace(str(tmp_path / "raw.csv"), filters, workers=1))
+
+@pytest.mark.parametrize("quoting", [csv.QUOTE_MINIMAL, csv.QUOTE_ALL])
+def test_quoted_newlines_survive_chunking(tmp_path, quoting):
+    # QUOTE_MINIMAL is what csv.writer and pandas write: a plain header, quoted fields only where needed
+    with open(tmp_path / "raw.csv", "w", newline="") as f:
+        writer = csv.writer(f, quoting=quoting)
+        writer.writerow(HEADER.strip().split(","))
+        for i in range(300):
+            writer.writerow([f'i{i}\nsays "hi"', 2, 0, i, i, i + 10])
+    report = ConversionReport(0, 0, {})
+    converted = list(read_raw_trace(str(tmp_path / "raw.csv"), workers=2, chunk_bytes=64, report=report))
+    assert [row[0] for row in converted] == [f'i{i}\nsays "hi"' for i in range(300)]
+    assert (report.rows, report.kept, report.dropped) == (300, 300, {})
+
+def test_convert_writes_a_sorted_trace(tmp_path):
+    write_raw(tmp_path / "raw.csv", raw_rows(500))
+    report = convert(str(tmp_path / "raw.csv"), str(tmp_path / "trace.csv"), workers=1)
+    with open(tmp_path / "trace.csv", newline="") as f:
+        out = list(csv.DictReader(f))
+    assert len(out) == report.kept
+    assert [float(row["submit_time"]) for row in out] == sorted(float(row["submit_time"]) for row in out)
@@ -0,0 +1,63 @@
+from core.events import ARRIVAL, COMPLETION, EventQueue
+from core.task import Task
+
+def make_task(id):
+    return Task(id=id, submit_time=0.0, cpu=1.0, gpu=0, duration=1.0)
+
+def test_events_pop_in_time_then_insertion_order():
+    queue = EventQueue()
+    a, b, c = make_task("a"), make_task("b"), make_task("c")
+    queue.push(5.0, ARRIVAL, a)
+    queue.push(1.0, COMPLETION, b)
+    queue.push(5.0, COMPLETION, c)
+    assert queue.next_time_after(0.0) == 1.0
+    assert list(queue.pop_due(5.0)) == [(COMPLETION, b), (ARRIVAL, a), (COMPLETION, c)]
+    assert len(queue) == 0 and queue.next_time_after(5.0) is None
+
+def test_events_pushed_while_popping_are_picked_up_when_due():
+    queue = EventQueue()
+    a, b = make_task("a"), make_task("b")
+    queue.push(1.0, ARRIVAL, a)
+    popped = []
+    for kind, task in queue.pop_due(2.0):
+        popped.append(task.id)
+        if task is a:
+            queue.push(2.0, ARRIVAL, b)
+    assert popped == ["a", "b"]
+
+def test_stale_completions_are_skipped():
+    queue = EventQueue()
+    task = make_task("a")
+    queue.push(3.0, COMPLETION, task)
+    task.preemptions += 1
+    queue.mark_stale()
+    queue.push(7.0, COMPLETION, task)
+    assert len(queue) == 1
+    assert queue.next_time_after(0.0) == 7.0
+    assert list(queue.pop_due(10.0)) == [(COMPLETION, task)]
+
+def test_next_time_looks_past_events_at_the_current_time():
+    queue = EventQueue()
+    queue.push(4.0, ARRIVAL, make_task("a"))
+    queue.push(9.0, ARRIVAL, make_task("b"))
+    assert queue.next_time_after(4.0) == 9.0
+
+def test_events_set_aside_at_the_current_time_still_pop_first():
+    queue = EventQueue()
+    tasks = [make_task(name) for name in "abcd"]
+    queue.push(4.0, COMPLETION, tasks[0])
+    queue.push(9.0, ARRIVAL, tasks[1])
+    queue.push(4.0, ARRIVAL, tasks[2])
+    assert queue.next_time_after(4.0) == 9.0
+    assert len(queue) == 3
+    queue.push(6.0, ARRIVAL, tasks[3])
+    assert queue.next_time_after(4.0) == 6.0
+    assert list(queue.pop_due(6.0)) == [(COMPLETION, tasks[0]), (ARRIVAL, tasks[2]), (ARRIVAL, tasks[3])]
+    assert queue.next_time_after(6.0) == 9.0
+
+def test_next_time_counts_set_aside_events_when_time_moves_back():
+    queue = EventQueue()
+    queue.push(5.0, ARRIVAL, make_task("a"))
+    queue.push(8.0, ARRIVAL, make_task("b"))
+    assert queue.next_time_after(5.0) == 8.0
+    assert queue.next_time_after(2.0) == 5.0
@@ -0,0 +1,28 @@
+import pytest
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from main import get_algorithm, get_cluster
+from trace.synthetic import generate_trace
+
+def run_instrumented(backend, algorithm, tmp_path):
+    cluster = get_cluster({"num_nodes": 8, "node_cpu": 192, "node_gpu": 2, "backend": backend})
+    scheduler = Scheduler(get_algorithm(algorithm, cluster))
+    tasks = list(generate_trace(400, total_cpu=8 * 192, seed=3, load=1.2, max_cpu=192, max_gpu=2))
+    config = {"algorithm": algorithm, "verbose": False, "logs_dir": str(tmp_path / backend),
+              "instrumentation": {"enabled": True}}
+    simulator = Simulator(cluster, scheduler, tasks, config)
+    simulator.run()
+    return simulator
+
+@pytest.mark.parametrize("algorithm", ["best_fit", "bin_packing"])
+def test_batch_placements_are_counted_on_every_backend(algorithm, tmp_path):
+    pytest.importorskip("numpy")
+    python = run_instrumented("python", algorithm, tmp_path).instrumentation
+    numpy = run_instrumented("numpy", algorithm, tmp_path).instrumentation
+    assert python.placement_successes == numpy.placement_successes == 400
+    assert python.placement_attempts == numpy.placement_attempts
+
+def test_strategy_wrappers_are_removed_after_the_run(tmp_path):
+    simulator = run_instrumented("python", "best_fit", tmp_path)
+    assert "select_node" not in vars(simulator.scheduler.strategy)
+    assert "select_nodes" not in vars(simulator.scheduler.strategy)
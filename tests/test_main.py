@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from trace.synthetic import generate_trace
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_main(tmp_path, *flags):
+    with open(tmp_path / "trace.csv", "w") as f:
+        f.write("id,submit_time,cpu,gpu,duration\n")
+        for t in generate_trace(200, total_cpu=2 * 96, seed=19, max_cpu=96, max_gpu=2):
+            f.write(f"{t.id},{t.submit_time},{t.cpu},{t.gpu},{t.duration}\n")
+    with open(tmp_path / "config.yaml", "w") as f:
+        f.write("cluster: {num_nodes: 2, node_cpu: 96, node_gpu: 2}\n"
+                "algorithm: best_fit\n"
+                "verbose: false\n"
+                f"trace_file: {tmp_path / 'trace.csv'}\n"
+                f"logs_dir: {tmp_path / 'logs'}\n")
+    # stdin is closed: a run that waited for a key press would fail instead of hanging
+    return subprocess.run([sys.executable, "main.py", "--config", str(tmp_path / "config.yaml"), "--headless", *flags],
+                          cwd=REPO, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120)
+
+def test_headless_run_logs_progress_to_stderr(tmp_path):
+    result = run_main(tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert "Completed 200/200 tasks" in result.stderr
+    assert "Completed" not in result.stdout
+    assert "Metrics Summary" in result.stdout
+    assert os.path.exists(tmp_path / "logs" / "task_log.csv")
+    assert not os.path.exists(tmp_path / "logs" / "plots")
+
+def test_log_stdout_restores_the_old_output(tmp_path):
+    result = run_main(tmp_path, "--log-stdout")
+    assert result.returncode == 0, result.stderr
+    assert "Completed 200/200 tasks" in result.stdout
@@ -0,0 +1,60 @@
+import os
+import random
+import pytest
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from core.sketch import QuantileSketch
+from core.task import Task
+from main import get_algorithm, get_cluster
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+def test_quantiles_are_within_relative_accuracy(relative_accuracy):
+    rng = random.Random(3)
+    values = [rng.lognormvariate(8, 2) for _ in range(5000)] + [0.0] * 100
+    sketch = QuantileSketch(relative_accuracy)
+    for value in values:
+        sketch.add(value)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=relative_accuracy, abs=1e-12)
+
+def test_merged_sketch_equals_a_single_sketch():
+    rng = random.Random(5)
+    values = [rng.expovariate(1e-3) for _ in range(2000)]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 3 else right).add(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert [left.quantile(q) for q in (0.1, 0.5, 0.99)] == [whole.quantile(q) for q in (0.1, 0.5, 0.99)]
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+def run(tmp_path, streaming):
+    cluster = get_cluster({"num_nodes": 4, "node_cpu": 96, "node_gpu": 2})
+    rng = random.Random(11)
+    tasks = [Task(id=f"t{i}", submit_time=i * 20.0, cpu=rng.uniform(1, 96), gpu=rng.randint(0, 2),
+                  duration=rng.uniform(100, 5000)) for i in range(400)]
+    config = {"algorithm": "best_fit", "verbose": False, "streaming_metrics": streaming,
+              "logs_dir": str(tmp_path / ("streaming" if streaming else "batch"))}
+    simulator = Simulator(cluster, Scheduler(get_algorithm("best_fit", cluster)), tasks, config)
+    simulator.run()
+    return simulator.metrics
+
+def test_streaming_collector_matches_the_in_memory_one(tmp_path):
+    batch = run(tmp_path, streaming=False)
+    streaming = run(tmp_path, streaming=True)
+    with open(os.path.join(batch.logs_dir, "task_log.csv")) as a, \
+            open(os.path.join(streaming.logs_dir, "task_log.csv")) as b:
+        assert a.read() == b.read()
+
+    expected, actual = batch.summary(), streaming.summary()
+    for key in ("avg_wait_time_ms", "avg_turnaround_time_ms", "max_wait_time_ms", "tasks_completed"):
+        assert actual[key] == pytest.approx(expected[key])
+    assert actual["median_wait_time_ms"] == pytest.approx(expected["median_wait_time_ms"], rel=0.01, abs=1e-9)
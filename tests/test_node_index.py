@@ -0,0 +1,44 @@
+import random
+from algorithms.best_fit import BestFitScheduler
+from algorithms.bin_packing import BinPackingScheduler
+from core.cluster import Cluster
+from core.task import Task
+
+def brute_force_best_fit(cluster, task, exclude=None):
+    best_node_id, best_score = None, float('inf')
+    for position, node in enumerate(cluster.nodes):
+        if position == exclude or not node.can_fit(task):
+            continue
+        score = (node.cpu_available - task.cpu) + (node.gpu_available - task.gpu)
+        if score < best_score:
+            best_node_id, best_score = node.id, score
+    return best_node_id
+
+def brute_force_bin_packing(cluster, task):
+    fullest_first = sorted(cluster.nodes, reverse=True,
+                           key=lambda node: (node.cpu_capacity - node.cpu_available) + (node.gpu_capacity - node.gpu_available))
+    return next((node.id for node in fullest_first if node.can_fit(task)), None)
+
+def test_indexed_choices_match_a_full_scan():
+    rng = random.Random(2)
+    cluster = Cluster({"pools": [{"name": "cpu", "count": 6, "node_cpu": 32, "node_gpu": 0},
+                                 {"name": "gpu", "count": 6, "node_cpu": 64, "node_gpu": 4},
+                                 {"name": "big", "count": 3, "node_cpu": 128, "node_gpu": 8}]})
+    best_fit, bin_packing = BestFitScheduler(cluster), BinPackingScheduler(cluster)
+    running = []
+    for i in range(3000):
+        task = Task(id=f"t{i}", submit_time=0.0, cpu=rng.choice([1, 2.5, 4, 8, 16, 33]), gpu=rng.choice([0, 0, 1, 2, 5]), duration=1.0)
+        assert best_fit.select_node(task) == brute_force_best_fit(cluster, task)
+        assert bin_packing.select_node(task) == brute_force_bin_packing(cluster, task)
+        exclude = rng.randrange(len(cluster.nodes))
+        assert best_fit._best_fit(task, exclude) == brute_force_best_fit(cluster, task, exclude)
+
+        # Change availability under the index: place the task somewhere random, or release one
+        if running and rng.random() < 0.5:
+            done = running.pop(rng.randrange(len(running)))
+            cluster.release_task(done, float(i))
+        else:
+            fitting = [node for node in cluster.nodes if node.can_fit(task)]
+            if fitting:
+                rng.choice(fitting).assign_task(task, float(i))
+                running.append(task)
@@ -0,0 +1,30 @@
+import pytest
+from core.task import Task
+from trace.parser import load_trace, stream_trace
+
+def write_csv(path, tasks):
+    with open(path, "w") as f:
+        f.write("id,submit_time,cpu,gpu,duration,priority\n")
+        for t in tasks:
+            f.write(f"{t.id},{t.submit_time},{t.cpu},{t.gpu},{t.duration},{t.priority}\n")
+
+def sample_tasks(n):
+    return [Task(id=f"t{i}", submit_time=float((i * 7) % 11), cpu=0.1 * i, gpu=i % 3, duration=10.0 + i, priority=i % 2)
+            for i in range(n)]
+
+def test_load_trace_reads_every_column(tmp_path):
+    tasks = sample_tasks(10)
+    write_csv(tmp_path / "trace.csv", tasks)
+    assert load_trace(str(tmp_path / "trace.csv")) == tasks
+
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_stream_trace_sorts_externally_like_sorted(tmp_path, chunk_size):
+    tasks = sample_tasks(50)
+    write_csv(tmp_path / "trace.csv", tasks)
+    streamed = list(stream_trace(str(tmp_path / "trace.csv"), chunk_size=chunk_size))
+    assert streamed == sorted(tasks, key=lambda t: t.submit_time)
+
+def test_presorted_stream_rejects_an_unsorted_trace(tmp_path):
+    write_csv(tmp_path / "trace.csv", sample_tasks(5))
+    with pytest.raises(ValueError, match="not sorted"):
+        list(stream_trace(str(tmp_path / "trace.csv"), presorted=True))
@@ -0,0 +1,42 @@
+import random
+from core.pending_queue import PendingQueue
+from core.task import Task
+
+def make_task(i, cpu, gpu, priority=0):
+    return Task(id=f"t{i}", submit_time=0.0, cpu=cpu, gpu=gpu, duration=1.0, priority=priority)
+
+def test_blocked_shapes_match_brute_force_dominance():
+    rng = random.Random(4)
+    for _ in range(50):
+        queue = PendingQueue()
+        blocked = []
+        for i in range(40):
+            task = make_task(i, rng.choice([0.5, 1.0, 2.25, 4.0, 8.0, 16.5]), rng.randint(0, 3), rng.randint(0, 2))
+            queue.block(task)
+            blocked.append(task)
+        for i in range(200):
+            probe = make_task(i, rng.uniform(0, 20), rng.randint(0, 4), rng.randint(0, 3))
+            expected = any(probe.priority <= b.priority and probe.cpu >= b.cpu and probe.gpu >= b.gpu
+                           for b in blocked)
+            assert queue.is_blocked(probe) == expected
+
+def test_capacity_freed_unblocks_everything():
+    queue = PendingQueue()
+    queue.block(make_task(0, 1.0, 0))
+    assert queue.is_blocked(make_task(1, 2.0, 1))
+    queue.capacity_freed()
+    assert not queue.is_blocked(make_task(1, 2.0, 1))
+
+def test_place_ready_orders_by_priority_then_arrival_and_skips_blocked_shapes():
+    queue = PendingQueue()
+    tasks = [make_task(0, 4.0, 0), make_task(1, 8.0, 0), make_task(2, 1.0, 0, priority=1), make_task(3, 2.0, 0)]
+    for task in tasks:
+        queue.push(task)
+    offered = []
+    def place(task):
+        offered.append(task.id)
+        return task.cpu < 4.0  # anything asking for 4 CPUs or more does not fit
+    queue.place_ready(place)
+    # t1 (8 CPUs) is never offered: the failure of t0 (4 CPUs) blocked it
+    assert offered == ["t2", "t0", "t3"]
+    assert [task.id for task in queue] == ["t0", "t1"]
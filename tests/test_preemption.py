@@ -0,0 +1,69 @@
+import csv
+import random
+from core.cluster import Cluster
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from core.task import Task
+from algorithms.best_fit import BestFitScheduler
+from trace.synthetic import generate_trace
+
+def prioritized_trace(num_tasks=300, seed=5):
+    rng = random.Random(seed)
+    tasks = list(generate_trace(num_tasks, total_cpu=4 * 192, seed=seed, load=1.5, max_cpu=192, max_gpu=2))
+    for task in tasks:
+        task.priority = rng.randint(0, 2)
+    return tasks
+
+def run_preemptive(tasks, tmp_path):
+    cluster = Cluster({"num_nodes": 4, "node_cpu": 192, "node_gpu": 2})
+    config = {"algorithm": "best_fit", "verbose": False, "preemption": True, "logs_dir": str(tmp_path)}
+    simulator = Simulator(cluster, Scheduler(BestFitScheduler(cluster)), tasks, config)
+    simulator.run()
+    return simulator
+
+def test_preempted_tasks_keep_their_duration_and_first_start(tmp_path):
+    tasks = prioritized_trace()
+    durations = {task.id: task.duration for task in tasks}
+    simulator = run_preemptive(tasks, tmp_path)
+    assert simulator.metrics.preemptions > 0
+
+    with open(tmp_path / "task_log.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(tasks)
+    for row in rows:
+        assert float(row["duration"]) == durations[row["id"]]
+        start_time, end_time = float(row["start_time"]), float(row["end_time"])
+        assert float(row["wait_time"]) == start_time - float(row["submit_time"])
+        # Preempted tasks take longer than their duration, never less
+        assert end_time - start_time >= float(row["duration"]) - 1e-6
+
+    preempted = [task for task in tasks if task.preemptions]
+    assert preempted and all(task.first_start_time < task.start_time for task in preempted)
+
+def test_running_tasks_with_the_same_id_are_tracked_separately():
+    from core.preemption import Preemptor
+    cluster = Cluster({"num_nodes": 2, "node_cpu": 4, "node_gpu": 0})
+    preemptor = Preemptor(cluster)
+    first, second = (Task(id="dup", submit_time=0.0, cpu=4, gpu=0, duration=10.0) for _ in range(2))
+    for node, task in zip(cluster.nodes, (first, second)):
+        node.assign_task(task, 0.0)
+        preemptor.started(task)
+    preemptor.stopped(first)
+    cluster.nodes[0].release_task(first, 10.0)
+
+    urgent = Task(id="urgent", submit_time=0.0, cpu=4, gpu=0, duration=1.0, priority=1)
+    node, victims = preemptor.find_victims(urgent, 5.0)
+    assert node is cluster.nodes[1] and victims == [second]
+
+def test_only_lower_priority_tasks_are_evicted():
+    from core.preemption import Preemptor
+    cluster = Cluster({"num_nodes": 2, "node_cpu": 4, "node_gpu": 0})
+    preemptor = Preemptor(cluster)
+    for node, priority in zip(cluster.nodes, (2, 0)):
+        task = Task(id=f"p{priority}", submit_time=0.0, cpu=4, gpu=0, duration=10.0, priority=priority)
+        node.assign_task(task, 0.0)
+        preemptor.started(task)
+    urgent = Task(id="urgent", submit_time=0.0, cpu=2, gpu=0, duration=1.0, priority=1)
+    node, victims = preemptor.find_victims(urgent, 5.0)
+    assert node is cluster.nodes[1] and [victim.id for victim in victims] == ["p0"]
+    assert preemptor.find_victims(Task(id="low", submit_time=0.0, cpu=2, gpu=0, duration=1.0), 5.0) is None
@@ -0,0 +1,33 @@
+import pytest
+from core.scheduler import Scheduler
+from core.task import Task
+from main import get_algorithm, get_cluster
+
+def make_task(id, cpu, gpu=0):
+    return Task(id=id, submit_time=0.0, cpu=cpu, gpu=gpu, duration=10.0)
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("algorithm", ["best_fit", "round_robin", "bin_packing", "backfill"])
+def test_failed_gang_restores_every_node_exactly(backend, algorithm):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    cluster = get_cluster({"num_nodes": 4, "node_cpu": 7.3, "node_gpu": 2, "backend": backend})
+    scheduler = Scheduler(get_algorithm(algorithm, cluster))
+    for i, cpu in enumerate([0.1, 2.7, 1.3]):
+        assert scheduler.schedule(make_task(f"bg{i}", cpu, 1), 0.0) is not None
+    before = [(node.cpu_available, node.gpu_available) for node in cluster.nodes]
+    used = cluster.utilization()
+
+    # Fits member by member until the last one, which no node can host
+    gang = [make_task(f"g{i}", cpu, 1) for i, cpu in enumerate([0.3, 1.1, 0.7])] + [make_task("huge", 8.0)]
+    assert scheduler.schedule_gang(gang, 1.0) is None
+    assert [(node.cpu_available, node.gpu_available) for node in cluster.nodes] == before
+    assert cluster.utilization() == used
+    assert all(task.assigned_node is None and task.start_time is None for task in gang)
+
+def test_gang_places_all_members_together():
+    cluster = get_cluster({"num_nodes": 2, "node_cpu": 4, "node_gpu": 1})
+    scheduler = Scheduler(get_algorithm("best_fit", cluster))
+    gang = [make_task("a", 4, 1), make_task("b", 4, 1)]
+    assert sorted(scheduler.schedule_gang(gang, 0.0)) == ["n-0", "n-1"]
+    assert all(node.cpu_available == 0 and node.gpu_available == 0 for node in cluster.nodes)
@@ -0,0 +1,70 @@
+import asyncio
+from algorithms.best_fit import BestFitScheduler
+from core.cluster import Cluster
+from core.scheduler import Scheduler
+from service import PlacementService
+
+def make_service(num_nodes=2, node_cpu=4, node_gpu=1):
+    cluster = Cluster({"num_nodes": num_nodes, "node_cpu": node_cpu, "node_gpu": node_gpu})
+    return PlacementService(Scheduler(BestFitScheduler(cluster)))
+
+def decide(service, *requests):
+    """Run one micro-batch and return the responses in request order."""
+    async def run():
+        loop = asyncio.get_running_loop()
+        batch = [(0.0, request, loop.create_future()) for request in requests]
+        service._decide(batch)
+        return [future.result() for _, _, future in batch]
+    return asyncio.run(run())
+
+def available(service):
+    return [(node.cpu_available, node.gpu_available) for node in service.cluster.nodes]
+
+def test_place_and_complete_restore_capacity():
+    service = make_service()
+    placed, = decide(service, {"op": "place", "id": "a", "cpu": 3, "gpu": 1})
+    assert placed["node"] is not None
+    assert decide(service, {"op": "complete", "id": "a"}) == [{"op": "complete", "id": "a", "ok": True}]
+    assert available(service) == [(4, 1), (4, 1)]
+
+def test_malformed_gang_does_not_break_the_batch():
+    service = make_service()
+    bad, good = decide(service,
+                       {"op": "place_gang", "id": "g", "tasks": 5},
+                       {"op": "place", "id": "a", "cpu": 1})
+    assert "error" in bad
+    assert good["node"] is not None
+
+def test_duplicate_ids_in_one_batch_are_rejected():
+    service = make_service()
+    first, second = decide(service,
+                           {"op": "place", "id": "a", "cpu": 1, "gpu": 1},
+                           {"op": "place", "id": "a", "cpu": 1, "gpu": 1})
+    assert first["node"] is not None
+    assert "error" in second
+    decide(service, {"op": "complete", "id": "a"})
+    assert available(service) == [(4, 1), (4, 1)]
+
+def test_duplicate_ids_in_one_gang_are_rejected():
+    service = make_service()
+    response, = decide(service, {"op": "place_gang", "id": "g", "tasks": [
+        {"id": "x", "cpu": 1}, {"id": "x", "cpu": 1}]})
+    assert "error" in response
+    assert available(service) == [(4, 1), (4, 1)]
+
+def test_negative_and_fractional_resources_are_rejected():
+    service = make_service()
+    responses = decide(service,
+                       {"op": "place", "id": "a", "cpu": -1000, "gpu": -8},
+                       {"op": "place", "id": "b", "cpu": 1, "gpu": 1.5},
+                       {"op": "place", "id": "c", "cpu": "lots"})
+    assert all("error" in response for response in responses)
+    assert available(service) == [(4, 1), (4, 1)]
+
+def test_failed_gang_places_nothing():
+    service = make_service()
+    response, = decide(service, {"op": "place_gang", "id": "g", "tasks": [
+        {"id": "x", "cpu": 4, "gpu": 1}, {"id": "y", "cpu": 4, "gpu": 1}, {"id": "z", "cpu": 4}]})
+    assert response["nodes"] is None
+    assert available(service) == [(4, 1), (4, 1)]
+    assert service.running == {}
@@ -0,0 +1,53 @@
+import csv
+import os
+import pytest
+from core.scheduler import Scheduler
+from core.sharding import ShardedSimulator, partition_cluster
+from core.simulator import Simulator
+from main import get_algorithm, get_cluster
+from trace.synthetic import generate_trace
+
+CLUSTER = {"num_nodes": 6, "node_cpu": 96, "node_gpu": 2}
+
+def make_tasks():
+    return list(generate_trace(500, total_cpu=6 * 96, seed=13, load=1.0, max_cpu=96, max_gpu=2))
+
+def task_ids(path):
+    with open(path, newline="") as f:
+        return [row[0] for row in list(csv.reader(f))[1:]]
+
+def test_partition_keeps_every_node_once():
+    pools = {"pools": [{"count": 3, "node_cpu": 64, "node_gpu": 0}, {"count": 4, "node_cpu": 96, "node_gpu": 8}]}
+    shards = partition_cluster(pools, 3)
+    assert [s["first_node"] for s in shards] == [0, 3, 5]
+    assert [[(p["count"], p["node_cpu"]) for p in s["pools"]] for s in shards] == [
+        [(3, 64)], [(2, 96)], [(2, 96)]]
+    with pytest.raises(ValueError):
+        partition_cluster(pools, 8)
+
+def test_one_shard_matches_the_single_process_run(tmp_path):
+    cluster = get_cluster(CLUSTER)
+    config = {"algorithm": "best_fit", "verbose": False, "streaming_metrics": True,
+              "logs_dir": str(tmp_path / "single")}
+    single = Simulator(cluster, Scheduler(get_algorithm("best_fit", cluster)), make_tasks(), config)
+    single.run()
+
+    sharded = ShardedSimulator(CLUSTER, make_tasks(), {
+        "algorithm": "best_fit", "logs_dir": str(tmp_path / "sharded"), "sharding": {"shards": 1}})
+    sharded.run()
+
+    with open(os.path.join(single.metrics.logs_dir, "task_log.csv")) as a, \
+            open(tmp_path / "sharded" / "shard-0" / "task_log.csv") as b:
+        assert a.read() == b.read()
+    assert sharded.metrics.summary() == pytest.approx(single.metrics.summary())
+
+@pytest.mark.parametrize("policy", ["round_robin", "hash", "least_loaded"])
+def test_every_task_runs_on_exactly_one_shard(tmp_path, policy):
+    tasks = make_tasks()
+    sharded = ShardedSimulator(CLUSTER, tasks, {
+        "algorithm": "round_robin", "logs_dir": str(tmp_path), "sharding": {"shards": 3, "policy": policy}})
+    sharded.run()
+
+    ids = [i for shard in range(3) for i in task_ids(tmp_path / f"shard-{shard}" / "task_log.csv")]
+    assert sorted(ids) == sorted(t.id for t in tasks)
+    assert sharded.metrics.summary()["tasks_completed"] == len(tasks)
@@ -0,0 +1,56 @@
+import os
+import random
+from core.scheduler import Scheduler
+from core.simulator import Simulator
+from main import get_algorithm, get_cluster
+from sweep import build_runs, run_sweep, save_results
+from trace.parser import load_trace
+
+def write_trace(path):
+    rng = random.Random(17)
+    with open(path, "w") as f:
+        f.write("id,submit_time,cpu,gpu,duration\n")
+        for i in range(300):
+            f.write(f"t{i},{i * 50.0},{rng.uniform(1, 96)},{rng.randint(0, 2)},{rng.uniform(100, 2000)}\n")
+
+def test_parallel_sweep_matches_sequential_runs(tmp_path):
+    trace = str(tmp_path / "trace.csv")
+    write_trace(trace)
+    sweep = {
+        "algorithms": ["best_fit", "round_robin"],
+        "clusters": [{"num_nodes": 4, "node_cpu": 96, "node_gpu": 2},
+                     {"pools": [{"count": 2, "node_cpu": 96, "node_gpu": 0}, {"count": 3, "node_cpu": 96, "node_gpu": 2}]}],
+        "traces": [trace],
+        "output_dir": str(tmp_path / "sweep"),
+        "workers": 2,
+    }
+    runs = build_runs(sweep)
+    assert [(run["label"], run["algorithm"]) for run in runs] == [
+        ("n4-cpu96-gpu2", "best_fit"), ("n4-cpu96-gpu2", "round_robin"),
+        ("2x96c0g+3x96c2g", "best_fit"), ("2x96c0g+3x96c2g", "round_robin")]
+
+    rows = run_sweep(sweep)
+    assert [(row["cluster"], row["algorithm"]) for row in rows] == [(run["label"], run["algorithm"]) for run in runs]
+    for run, row in zip(runs, rows):
+        cluster = get_cluster(run["cluster"])
+        sim = Simulator(cluster, Scheduler(get_algorithm(run["algorithm"], cluster)), load_trace(trace),
+                        {"algorithm": run["algorithm"], "verbose": False, "logs_dir": str(tmp_path / "expected")})
+        sim.run()
+        assert {key: row[key] for key in sim.metrics.summary()} == sim.metrics.summary()
+        assert os.path.exists(os.path.join(run["logs_dir"], "task_log.csv"))
+
+    save_results(rows, str(tmp_path / "sweep" / "results.csv"))
+    with open(tmp_path / "sweep" / "results.csv") as f:
+        assert len(f.readlines()) == len(runs) + 1
+
+def test_clusters_differing_only_in_settings_get_their_own_logs():
+    base = {"num_nodes": 4, "node_cpu": 96, "node_gpu": 2}
+    sweep = {
+        "algorithms": ["best_fit"],
+        "clusters": [dict(base, backend="python"), dict(base, backend="numpy"), dict(base), dict(base)],
+        "traces": ["trace.csv"],
+    }
+    runs = build_runs(sweep)
+    assert [run["label"] for run in runs] == [
+        "n4-cpu96-gpu2-backend=python", "n4-cpu96-gpu2-backend=numpy", "n4-cpu96-gpu2-1", "n4-cpu96-gpu2-2"]
+    assert len({run["logs_dir"] for run in runs}) == 4
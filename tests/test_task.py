@@ -0,0 +1,25 @@
+import pickle
+import pytest
+from core.task import Task
+
+def test_task_has_no_instance_dict():
+    task = Task(id="t", submit_time=0.0, cpu=1.0, gpu=0, duration=5.0)
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.unknown_field = 1
+
+def test_task_survives_pickling_with_its_run_state():
+    task = Task(id="t", submit_time=1.0, cpu=2.5, gpu=1, duration=5.0, priority=2)
+    task.start_time, task.end_time, task.assigned_node = 3.0, 8.0, "n-0"
+    task.remaining, task.first_start_time, task.preemptions = 4.0, 2.0, 1
+    copy = pickle.loads(pickle.dumps(task))
+    assert copy == task
+    assert copy.work_left == 4.0
+
+def test_work_left_defaults_to_the_duration():
+    task = Task(id="t", submit_time=0.0, cpu=1.0, gpu=0, duration=5.0)
+    assert task.work_left == 5.0
+    assert task.is_running(0.0) is False
+    task.start_time, task.end_time = 1.0, 6.0
+    assert task.is_running(1.0) and not task.is_running(6.0)
+    assert task.is_completed(6.0)
@@ -0,0 +1,43 @@
+import pytest
+from core.task import Task
+from trace.parser import load_trace
+
+np = pytest.importorskip("numpy")
+from trace.binary import TRACE_DTYPE, ids_path, write_binary_trace
+
+def write_trace(path, tasks):
+    write_binary_trace(str(path), [t.id for t in tasks], [t.submit_time for t in tasks],
+                       [t.cpu for t in tasks], [t.gpu for t in tasks], [t.duration for t in tasks],
+                       [t.priority for t in tasks])
+
+def sample_tasks(n):
+    return [Task(id=f"t{i}", submit_time=float((i * 7) % 11), cpu=1.5 * i, gpu=i % 3, duration=10.0 + i, priority=i % 4)
+            for i in range(n)]
+
+def test_binary_trace_round_trips(tmp_path):
+    tasks = sample_tasks(20)
+    write_trace(tmp_path / "trace.npy", tasks)
+    assert load_trace(str(tmp_path / "trace.npy")) == tasks
+
+def test_traces_without_priorities_load_at_priority_zero(tmp_path):
+    tasks = sample_tasks(6)
+    write_trace(tmp_path / "trace.npy", tasks)
+    records = np.load(tmp_path / "trace.npy")
+    unprioritized = np.empty(len(records), dtype=[(name, TRACE_DTYPE[name]) for name in TRACE_DTYPE.names
+                                                  if name != "priority"])
+    for name in unprioritized.dtype.names:
+        unprioritized[name] = records[name]
+    np.save(tmp_path / "trace.npy", unprioritized)
+    loaded = load_trace(str(tmp_path / "trace.npy"))
+    assert [t.priority for t in loaded] == [0] * 6
+    assert [(t.id, t.submit_time, t.duration) for t in loaded] == [(t.id, t.submit_time, t.duration) for t in tasks]
+
+def test_short_id_table_is_reported_with_both_files(tmp_path):
+    write_trace(tmp_path / "trace.npy", sample_tasks(5))
+    id_file = ids_path(str(tmp_path / "trace.npy"))
+    with open(id_file) as f:
+        ids = f.readlines()
+    with open(id_file, "w") as f:
+        f.writelines(ids[:3])
+    with pytest.raises(ValueError, match=r"trace\.ids.*3 task ids.*trace\.npy.*5 records"):
+        load_trace(str(tmp_path / "trace.npy"))
@@ -0,0 +1,88 @@
+"""
+Binary columnar trace format.
+
+A trace is stored as a NumPy `.npy` file holding a structured array with one
+record per task (submit_time, cpu, gpu, duration, priority), plus a sidecar `.ids`
+string table with one task id per line in the same order. The `.npy` file is opened
+memory-mapped, so loading it does not parse or copy anything up front. Files written
+before priorities were stored are still read, with every task at priority 0.
+"""
+import os
+from typing import Iterator, Optional, Sequence
+import numpy as np
+from core.task import Task
+
+TRACE_DTYPE = np.dtype([
+    ("submit_time", "<f8"),
+    ("cpu", "<f8"),
+    ("gpu", "<i8"),
+    ("duration", "<f8"),
+    ("priority", "<i8"),
+])
+_UNPRIORITIZED_DTYPE = np.dtype([(name, TRACE_DTYPE[name]) for name in TRACE_DTYPE.names if name != "priority"])
+
+def ids_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".ids"
+
+def write_binary_trace(path: str, ids: Sequence[str], submit_times: Sequence[float],
+                       cpus: Sequence[float], gpus: Sequence[int], durations: Sequence[float],
+                       priorities: Optional[Sequence[int]]=None):
+    """Write the given task columns as a `.npy` record file plus its id table; priorities default to 0."""
+    if not path.endswith(".npy"):
+        raise ValueError(f"Binary trace path must end with .npy: '{path}'")
+
+    records = np.empty(len(ids), dtype=TRACE_DTYPE)
+    records["submit_time"] = submit_times
+    records["cpu"] = cpus
+    records["gpu"] = gpus
+    records["duration"] = durations
+    records["priority"] = 0 if priorities is None else priorities
+    np.save(path, records)
+
+    with open(ids_path(path), "w") as f:
+        for task_id in ids:
+            f.write(f"{task_id}\n")
+
+def open_binary_trace(path: str) -> np.ndarray:
+    """Memory-map the task records of a binary trace (zero-copy, read-only)."""
+    records = np.load(path, mmap_mode="r")
+    if records.dtype not in (TRACE_DTYPE, _UNPRIORITIZED_DTYPE):
+        raise ValueError(f"'{path}' is not a binary trace (dtype {records.dtype})")
+    return records
+
+def _count_lines(path: str, block_size: int=1 << 20) -> int:
+    with open(path, "rb") as f:
+        return sum(block.count(b"\n") for block in iter(lambda: f.read(block_size), b""))
+
+def iter_binary_trace(path: str, chunk_size: int=65536) -> Iterator[Task]:
+    """
+    Lazily yields the tasks of a binary trace in file order. Raises ValueError
+    right away if the id table does not hold one id per record.
+    """
+    records = open_binary_trace(path)
+    id_count = _count_lines(ids_path(path))
+    if id_count != len(records):
+        raise ValueError(f"'{ids_path(path)}' has {id_count} task ids but '{path}' has {len(records)} records")
+    return _iter_records(path, records, chunk_size)
+
+def _iter_records(path: str, records: np.ndarray, chunk_size: int) -> Iterator[Task]:
+    with open(ids_path(path)) as id_file:
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            if "priority" in chunk.dtype.names:
+                priorities = chunk["priority"].tolist()
+            else:
+                priorities = [0] * len(chunk)
+            columns = zip(
+                chunk["submit_time"].tolist(), chunk["cpu"].tolist(),
+                chunk["gpu"].tolist(), chunk["duration"].tolist(), priorities
+            )
+            for submit_time, cpu, gpu, duration, priority in columns:
+                yield Task(
+                    id=next(id_file).rstrip("\n"),
+                    submit_time=submit_time,
+                    cpu=cpu,
+                    gpu=gpu,
+                    duration=duration,
+                    priority=priority
+                )
@@ -1,21 +1,109 @@
 import csv
-from typing import List
+import heapq
+import os
+import tempfile
+from typing import Iterator, List
 from core.task import Task
 
+TRACE_COLUMNS = ["id", "submit_time", "cpu", "gpu", "duration"]
+PRIORITY_COLUMN = "priority"  # optional; tasks default to priority 0
+
 def load_trace(path: str) -> List[Task]:
     """
     Parses a trace CSV file with columns: submit_time, cpu, gpu, duration
+    and optionally priority.
+    Paths ending in .npy are read as binary traces (see trace.binary).
+    """
+    return list(iter_trace(path))
+
+def iter_trace(path: str) -> Iterator[Task]:
+    """
+    Lazily yields the tasks of a trace file in file order.
     """
-    tasks = []
+    if path.endswith(".npy"):
+        from trace.binary import iter_binary_trace  # NumPy is only needed for binary traces
+        return iter_binary_trace(path)
+    return _iter_csv_trace(path)
+
+def _iter_csv_trace(path: str) -> Iterator[Task]:
     with open(path, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        id_col, submit_col, cpu_col, gpu_col, duration_col = (header.index(c) for c in TRACE_COLUMNS)
+        if PRIORITY_COLUMN not in header:
+            for row in reader:
+                yield Task(
+                    id=str(row[id_col]),
+                    submit_time=float(row[submit_col]),
+                    cpu=float(row[cpu_col]),
+                    gpu=int(row[gpu_col]),
+                    duration=float(row[duration_col])
+                )
+            return
+
+        priority_col = header.index(PRIORITY_COLUMN)
         for row in reader:
-            task = Task(
-                id=str(row["id"]),
-                submit_time=float(row["submit_time"]),
-                cpu=float(row["cpu"]),
-                gpu=int(row["gpu"]),
-                duration=float(row["duration"])
+            yield Task(
+                id=str(row[id_col]),
+                submit_time=float(row[submit_col]),
+                cpu=float(row[cpu_col]),
+                gpu=int(row[gpu_col]),
+                duration=float(row[duration_col]),
+                priority=int(row[priority_col] or 0)
             )
-            tasks.append(task)
-    return tasks
\ No newline at end of file
+
+def stream_trace(path: str, presorted: bool=False, chunk_size: int=1_000_000) -> Iterator[Task]:
+    """
+    Yields the tasks of a trace in submit_time order while holding at most
+    chunk_size tasks in memory. A presorted trace is read straight through;
+    otherwise it is sorted externally in chunks that are merged back lazily.
+    Ties keep file order, matching sorted() on the fully loaded trace.
+    """
+    if presorted:
+        return _checked_order(iter_trace(path), path)
+    return _external_sort(path, chunk_size)
+
+def _checked_order(tasks: Iterator[Task], path: str) -> Iterator[Task]:
+    last_submit_time = float('-inf')
+    for task in tasks:
+        if task.submit_time < last_submit_time:
+            raise ValueError(f"Trace '{path}' is not sorted by submit_time (task {task.id})")
+        last_submit_time = task.submit_time
+        yield task
+
+def _external_sort(path: str, chunk_size: int) -> Iterator[Task]:
+    with tempfile.TemporaryDirectory(prefix="trace-sort-") as tmp_dir:
+        run_paths = []
+        chunk: List[Task] = []
+        for task in iter_trace(path):
+            chunk.append(task)
+            if len(chunk) >= chunk_size:
+                run_paths.append(_write_sorted_run(chunk, tmp_dir, len(run_paths)))
+                chunk = []
+
+        if not run_paths:
+            # Everything fit in one chunk; no need to touch the disk
+            yield from sorted(chunk, key=lambda t: t.submit_time)
+            return
+        if chunk:
+            run_paths.append(_write_sorted_run(chunk, tmp_dir, len(run_paths)))
+            chunk = []
+
+        # Runs are numbered in file order, so merging on (submit_time, run) keeps ties stable
+        runs = [_keyed_run(run_path, run) for run, run_path in enumerate(run_paths)]
+        for _, _, task in heapq.merge(*runs, key=lambda entry: entry[:2]):
+            yield task
+
+def _keyed_run(run_path: str, run: int) -> Iterator:
+    for task in iter_trace(run_path):
+        yield task.submit_time, run, task
+
+def _write_sorted_run(chunk: List[Task], tmp_dir: str, run: int) -> str:
+    chunk.sort(key=lambda t: t.submit_time)
+    run_path = os.path.join(tmp_dir, f"run-{run}.csv")
+    with open(run_path, "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(TRACE_COLUMNS + [PRIORITY_COLUMN])
+        for t in chunk:
+            writer.writerow([t.id, t.submit_time, t.cpu, t.gpu, t.duration, t.priority])
+    return run_path